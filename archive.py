@@ -0,0 +1,213 @@
+# archive.py
+"""Single-file session archives for Steps Recorder recordings.
+
+A session folder (screenshots, thumbnails, report pages, steps_data.json)
+is packed into one uncompressed zip, session_*.bubble. Screenshots are
+already compressed, so storing them as-is costs nothing in size and lets
+any member be read straight out of a memory-mapped archive without
+unpacking. The last member, index.json, lists every step's metadata and
+the offset and size of every member.
+
+Usage: python archive.py pack recordings/session_20250101_120000 [--remove]
+       python archive.py list recordings/session_20250101_120000.bubble
+       python archive.py extract recordings/session_20250101_120000.bubble [dest]
+       python archive.py serve recordings/session_20250101_120000.bubble [--port 8765]
+"""
+import argparse
+import json
+import mimetypes
+import mmap
+import os
+import shutil
+import struct
+import sys
+import zipfile
+from journal import step_record
+
+ARCHIVE_EXT = ".bubble"
+INDEX_NAME = "index.json"
+ARCHIVE_VERSION = 1
+
+# Zip local file header: signature, then name/extra lengths at offset 26
+LOCAL_HEADER_SIZE = 30
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+def archive_path(session_dir):
+    return session_dir.rstrip("/\\") + ARCHIVE_EXT
+
+def pack_session(session_dir, path=None):
+    """Pack a session folder into a single archive and return its path"""
+    path = path or archive_path(session_dir)
+    members = []
+    for root, dirs, files in os.walk(session_dir):
+        dirs.sort()
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            members.append((os.path.relpath(full, session_dir).replace(os.sep, "/"), full))
+
+    steps = []
+    steps_file = os.path.join(session_dir, "steps_data.json")
+    if os.path.exists(steps_file):
+        with open(steps_file, 'r', encoding='utf-8') as f:
+            steps = json.load(f)
+    steps = [step_record(step) for step in steps]
+    for step in steps:
+        # Screenshot paths are relative to where the recorder ran
+        step['screenshot'] = os.path.basename(step['screenshot'])
+
+    tmp_path = path + ".tmp"
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED) as zf:
+        for name, full in members:
+            zf.write(full, name)
+        files = {info.filename: [info.header_offset, info.file_size] for info in zf.infolist()}
+        index = {"version": ARCHIVE_VERSION, "steps": steps, "files": files}
+        zf.writestr(INDEX_NAME, json.dumps(index))
+    os.replace(tmp_path, path)
+    return path
+
+class SessionArchive:
+    """Read-only view of a packed session; members are served from an mmap"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            with zipfile.ZipFile(self._file) as zf:
+                if INDEX_NAME in zf.namelist():
+                    index = json.loads(zf.read(INDEX_NAME))
+                else:
+                    # Any stored zip works; rebuild the index from its directory
+                    index = {"steps": [], "files": {info.filename: [info.header_offset, info.file_size]
+                                                    for info in zf.infolist()
+                                                    if info.compress_type == zipfile.ZIP_STORED}}
+        except Exception:
+            self.close()
+            raise
+        self.steps = index.get("steps", [])
+        self._files = index["files"]
+
+    def names(self):
+        return list(self._files)
+
+    def __contains__(self, name):
+        return name in self._files
+
+    def size(self, name):
+        return self._files[name][1]
+
+    def read(self, name):
+        """Return a copy of a member's bytes, safe to keep after close()"""
+        with self._view(name) as view:
+            return bytes(view)
+
+    def _view(self, name):
+        """A member's bytes as a memoryview into the mapped archive, without
+        copying. Release it before close(); the map cannot close while
+        views of it are alive."""
+        header_offset, size = self._files[name]
+        header = self._map[header_offset:header_offset + LOCAL_HEADER_SIZE]
+        if header[:4] != LOCAL_HEADER_SIGNATURE:
+            raise ValueError(f"Corrupt archive entry: {name}")
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        start = header_offset + LOCAL_HEADER_SIZE + name_length + extra_length
+        return memoryview(self._map)[start:start + size]
+
+    def read_screenshot(self, step_number):
+        """Screenshot bytes for a 1-based step number"""
+        return self.read(self.steps[step_number - 1]['screenshot'])
+
+    def extract(self, dest):
+        for name in self._files:
+            target = os.path.join(dest, *name.split("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                with self._view(name) as view:
+                    f.write(view)
+
+    def close(self):
+        if getattr(self, '_map', None):
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def serve(archive, port):
+    """Serve an archive's report and screenshots to the browser over HTTP"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = self.path.split("?", 1)[0].lstrip("/") or "report.html"
+            if name not in archive:
+                self.send_error(404)
+                return
+            with archive._view(name) as data:
+                self.send_response(200)
+                self.send_header("Content-Type", mimetypes.guess_type(name)[0] or "application/octet-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    print(f"Serving {archive.path} at http://127.0.0.1:{server.server_port}/report.html")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack = subparsers.add_parser("pack", help="pack session folders into archives")
+    pack.add_argument("sessions", nargs="+")
+    pack.add_argument("--remove", action="store_true", help="delete each folder once packed")
+
+    listing = subparsers.add_parser("list", help="show an archive's steps and members")
+    listing.add_argument("archive")
+
+    extract = subparsers.add_parser("extract", help="unpack an archive into a folder")
+    extract.add_argument("archive")
+    extract.add_argument("dest", nargs="?")
+
+    serve_cmd = subparsers.add_parser("serve", help="view an archive's report in the browser")
+    serve_cmd.add_argument("archive")
+    serve_cmd.add_argument("--port", type=int, default=8765)
+
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        for session_dir in args.sessions:
+            path = pack_session(session_dir)
+            print(f"Packed {session_dir} -> {path} ({os.path.getsize(path) / 1024:.0f} KiB)")
+            if args.remove:
+                shutil.rmtree(session_dir)
+        return 0
+
+    with SessionArchive(args.archive) as archive:
+        if args.command == "list":
+            for number, step in enumerate(archive.steps, 1):
+                print(f"Step {number} ({step['timestamp']}): {step['window']} [{step['screenshot']}]")
+            for name in archive.names():
+                print(f"  {name} ({archive.size(name)} bytes)")
+        elif args.command == "extract":
+            dest = args.dest or args.archive[:-len(ARCHIVE_EXT)]
+            archive.extract(dest)
+            print(f"Extracted to {dest}")
+        elif args.command == "serve":
+            serve(archive, args.port)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
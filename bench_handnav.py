@@ -0,0 +1,245 @@
+# bench_handnav.py
+"""Headless benchmarks for the hand-navigation pipeline.
+
+No camera or display is needed: frames come from a video file or a
+synthetic generator and go through the same HandDetector code the
+tracking worker runs.
+
+  pipeline  Time HandDetector.process_frame per frame and per stage
+            (cvtColor, inRange, morphology, findContours, moments, ...)
+            and report fps and p50/p99 latency as JSON.
+  compare   Run the original allocate-every-frame detection and the
+            current HandDetector on the same frames, check that both find
+            the same hand centers, and print time and temporary
+            allocations per frame.
+
+Usage: python bench_handnav.py pipeline [--video clip.mp4] [--json out.json]
+                               [--fail-above-p99 MS]
+       python bench_handnav.py compare [--frames 300] [--scale 1.0]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from handdetect import HandDetector, StageTimer
+
+def reference_detect_hand_in_zone(frame, zone_mask):
+    """Original detection code, allocating every buffer on each call"""
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    lower_skin = np.array([0, 30, 60], dtype=np.uint8)
+    upper_skin = np.array([20, 150, 255], dtype=np.uint8)
+    skin_mask = cv2.inRange(hsv, lower_skin, upper_skin)
+    skin_mask = cv2.bitwise_and(skin_mask, skin_mask, mask=zone_mask)
+    kernel = np.ones((5, 5), np.uint8)
+    skin_mask = cv2.erode(skin_mask, kernel, iterations=1)
+    skin_mask = cv2.dilate(skin_mask, kernel, iterations=2)
+    skin_mask = cv2.GaussianBlur(skin_mask, (5, 5), 0)
+    contours, _ = cv2.findContours(skin_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    valid_contours = []
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if 8000 < area < 50000:
+            x, y, w, h = cv2.boundingRect(contour)
+            aspect_ratio = h / w if w > 0 else 0
+            if 0.8 < aspect_ratio < 3.0:
+                valid_contours.append(contour)
+
+    if valid_contours:
+        largest_contour = max(valid_contours, key=cv2.contourArea)
+        M = cv2.moments(largest_contour)
+        if M["m00"] != 0:
+            return (int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"]))
+    return None
+
+def reference_detection_mask(frame_shape, zone):
+    """Original per-frame zone mask construction"""
+    h, w = frame_shape[:2]
+    mask = np.zeros((h, w), dtype=np.uint8)
+    if zone == "bottom":
+        mask[h//2:, :] = 255
+    elif zone == "left":
+        mask[:, :w//3] = 255
+    elif zone == "right":
+        mask[:, 2*w//3:] = 255
+    else:
+        mask[:, :] = 255
+    return mask
+
+def synthetic_frames(count, width, height, seed=0):
+    """Yield noisy BGR frames with a skin-coloured 'hand' moving through them"""
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 80, size=(height, width, 3), dtype=np.uint8)
+    hand_w, hand_h = width // 8, height // 4
+    for i in range(count):
+        frame = background.copy()
+        cx = width // 2 + int(width * 0.3 * np.sin(i / 25.0))
+        cy = int(height * 0.7 + height * 0.15 * np.cos(i / 15.0))
+        cv2.ellipse(frame, (cx, cy), (hand_w // 2, hand_h // 2), 0, 0, 360,
+                    (120, 150, 200), -1)
+        yield frame
+
+def run(name, frames, detect):
+    """Time detect() over frames, returning (results, ms/frame, KiB allocated/frame)"""
+    results = []
+    timings = []
+    peaks = []
+    tracemalloc.start()
+    for frame in frames:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        results.append(detect(frame))
+        timings.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    ms = 1000 * sum(timings) / len(timings)
+    kib = sum(peaks) / len(peaks) / 1024
+    print(f"{name:>10}: {ms:7.2f} ms/frame  {kib:9.1f} KiB allocated/frame")
+    return results
+
+def video_frames(path, count=None):
+    """Yield BGR frames from a video file"""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"Could not open video: {path}")
+    try:
+        read = 0
+        while count is None or read < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            read += 1
+            yield frame
+    finally:
+        cap.release()
+
+def summarize(samples):
+    """Mean/p50/p99/max in milliseconds for a list of seconds"""
+    ms = np.asarray(samples) * 1000
+    return {
+        "mean": round(float(ms.mean()), 3),
+        "p50": round(float(np.percentile(ms, 50)), 3),
+        "p99": round(float(np.percentile(ms, 99)), 3),
+        "max": round(float(ms.max()), 3),
+    }
+
+def bench_pipeline(args):
+    """Run process_frame over the source frames and report timings as JSON"""
+    if args.video:
+        frames = video_frames(args.video, args.frames)
+        source = args.video
+    else:
+        frames = synthetic_frames(args.frames or 300, args.width, args.height)
+        source = "synthetic"
+
+    detector = HandDetector(args.zone, analysis_scale=args.scale, smoothing=args.smoothing)
+    detector.tracking = not args.no_tracking
+    timer = StageTimer()
+    latencies = []
+    found = 0
+    resolution = None
+
+    for i, frame in enumerate(frames):
+        if i == args.warmup:
+            detector.search_stats = {"window": 0, "zone": 0}
+        # Warm-up frames allocate buffers and are not measured
+        detector.stage_timer = timer if i >= args.warmup else None
+        timer.begin_frame()
+        start = time.perf_counter()
+        _, hand_center = detector.process_frame(frame)
+        elapsed = time.perf_counter() - start
+        timer.end_frame()
+        if i < args.warmup:
+            continue
+        resolution = [frame.shape[1], frame.shape[0]]
+        latencies.append(elapsed)
+        found += 1 if hand_center else 0
+
+    if not latencies:
+        raise SystemExit("No frames were measured")
+
+    report = {
+        "source": source,
+        "frames": len(latencies),
+        "resolution": resolution,
+        "zone": args.zone,
+        "analysis_scale": args.scale,
+        "hand_found": found,
+        "tracking": detector.tracking,
+        "searches": detector.search_stats,
+        "fps": round(len(latencies) / sum(latencies), 1),
+        "latency_ms": summarize(latencies),
+        "stages_ms": {stage: summarize(samples) for stage, samples in timer.samples.items()},
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.json:
+        with open(args.json, 'w') as f:
+            f.write(output)
+    print(output)
+
+    if args.fail_above_p99 and report["latency_ms"]["p99"] > args.fail_above_p99:
+        print(f"p99 latency {report['latency_ms']['p99']} ms exceeds {args.fail_above_p99} ms",
+              file=sys.stderr)
+        return 1
+    return 0
+
+def bench_compare(args):
+    """Compare the original detection code with the current HandDetector"""
+    frames = list(synthetic_frames(args.frames, args.width, args.height))
+    detector = HandDetector(args.zone, analysis_scale=args.scale)
+
+    before = run("before", frames, lambda f: reference_detect_hand_in_zone(
+        f, reference_detection_mask(f.shape, args.zone)))
+    after = run("after", frames, lambda f: detector.detect_hand_in_zone(
+        f, detector.get_zone_rect(f.shape)))
+
+    mismatches = sum(1 for a, b in zip(before, after) if a != b)
+    print(f"hand found in {sum(1 for r in after if r)}/{len(after)} frames, "
+          f"{mismatches} mismatches")
+
+    both = [(a, b) for a, b in zip(before, after) if a and b]
+    if both:
+        error = sum(np.hypot(a[0] - b[0], a[1] - b[1]) for a, b in both) / len(both)
+        print(f"mean center error: {error:.2f} px")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(sub, frames_default):
+        sub.add_argument("--frames", type=int, default=frames_default)
+        sub.add_argument("--width", type=int, default=1280)
+        sub.add_argument("--height", type=int, default=720)
+        sub.add_argument("--zone", default="bottom", choices=["bottom", "left", "right", "full"])
+        sub.add_argument("--scale", type=float, default=1.0,
+                         help="analysis scale for the detector (e.g. 0.5)")
+
+    pipeline = subparsers.add_parser("pipeline", help="per-stage timings, fps and latency as JSON")
+    add_common(pipeline, None)
+    pipeline.add_argument("--video", help="read frames from this video instead of synthetic ones")
+    pipeline.add_argument("--warmup", type=int, default=10, help="unmeasured frames at the start")
+    pipeline.add_argument("--no-tracking", action="store_true",
+                          help="search the whole zone on every frame")
+    pipeline.add_argument("--smoothing", type=float, default=0.4,
+                          help="hand center smoothing (0 = raw detections)")
+    pipeline.add_argument("--json", help="also write the report to this file")
+    pipeline.add_argument("--fail-above-p99", type=float, metavar="MS",
+                          help="exit with status 1 if p99 latency exceeds MS")
+    pipeline.set_defaults(func=bench_pipeline)
+
+    compare = subparsers.add_parser("compare", help="original vs current detection")
+    add_common(compare, 300)
+    compare.set_defaults(func=bench_compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
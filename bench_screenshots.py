@@ -0,0 +1,79 @@
+# bench_screenshots.py
+"""Encode-time and size benchmark for the Steps Recorder screenshot profiles.
+
+Encodes sample captures (e.g. step_*.png files from an existing
+recordings/session_* folder, or a live grab of the primary monitor) with
+every profile and downscale option and reports the median encode time
+and bytes per step.
+
+Usage: python bench_screenshots.py recordings/session_*/step_*.png [--repeat 3] [--json out.json]
+       python bench_screenshots.py --grab
+"""
+import argparse
+import io
+import json
+import statistics
+import time
+from PIL import Image
+from screenshots import SCREENSHOT_PROFILES, SCREENSHOT_SCALES, encode_image, prepare_image
+
+def load_samples(paths, grab):
+    """Return RGB sample images from files and/or a live screen grab"""
+    samples = [Image.open(path).convert('RGB') for path in paths]
+    if grab:
+        import mss
+        from screenshots import image_from_bgra
+        with mss.mss() as sct:
+            shot = sct.grab(sct.monitors[1])
+            samples.append(image_from_bgra(shot.size, shot.bgra))
+    return samples
+
+def bench(samples, repeat):
+    """Return one result dict per profile/scale combination"""
+    results = []
+    for profile_name in SCREENSHOT_PROFILES:
+        for scale_name, scale in SCREENSHOT_SCALES.items():
+            timings = []
+            sizes = []
+            for img in samples:
+                for _ in range(repeat):
+                    buf = io.BytesIO()
+                    start = time.perf_counter()
+                    # Downscaling is part of the per-step cost
+                    encode_image(prepare_image(img, scale), buf, profile_name)
+                    timings.append(time.perf_counter() - start)
+                sizes.append(buf.tell())
+            results.append({
+                "profile": profile_name,
+                "scale": scale_name,
+                "encode_ms": round(statistics.median(timings) * 1000, 1),
+                "bytes_per_step": int(statistics.mean(sizes)),
+            })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("images", nargs="*", help="sample screenshots")
+    parser.add_argument("--grab", action="store_true", help="also benchmark a live grab of the primary monitor")
+    parser.add_argument("--repeat", type=int, default=3, help="encodes per sample and profile")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    samples = load_samples(args.images, args.grab)
+    if not samples:
+        parser.error("give sample images or --grab")
+
+    sizes = ", ".join(f"{img.width}x{img.height}" for img in samples)
+    print(f"{len(samples)} sample(s): {sizes}")
+    results = bench(samples, args.repeat)
+
+    print(f"{'profile':<20} {'scale':<10} {'encode ms':>10} {'KiB/step':>10}")
+    for r in results:
+        print(f"{r['profile']:<20} {r['scale']:<10} {r['encode_ms']:>10.1f} {r['bytes_per_step'] / 1024:>10.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+# export_sessions.py
+"""Headless batch export for Steps Recorder sessions.
+
+Rebuilds thumbnails, the LLM summary, the HTML report and steps_data.json
+for many recordings/session_* folders at once, in a process pool. No
+display is needed. A session is skipped when its inputs (step journal or
+steps_data.json, and screenshots) are unchanged since its last export,
+compared by size and mtime, or by content hash with --hash.
+
+Usage: python export_sessions.py [recordings/session_* ...] [--workers 4]
+                                 [--no-summary] [--hash] [--force]
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image
+from journal import journal_path, step_record
+from report import write_report
+from screenshots import make_thumbnail, thumbnail_path
+from search_index import SearchIndex, read_session_steps
+from summarizer import (SUMMARY_FILE, CHUNK_SIZE, build_session_prompt, stream_summary,
+                        summarize_chunk)
+
+STAMP_FILE = ".export_stamp.json"
+# Bump when the export output changes, so every session is rebuilt once
+EXPORT_VERSION = 1
+
+def session_inputs(session_dir, steps, use_hash):
+    """Fingerprint of everything an export is built from"""
+    names = [journal_path(session_dir) if os.path.exists(journal_path(session_dir))
+             else os.path.join(session_dir, "steps_data.json")]
+    names += [step['screenshot'] for step in steps]
+
+    digest = hashlib.sha1()
+    for name in names:
+        digest.update(name.encode('utf-8'))
+        try:
+            if use_hash:
+                with open(name, 'rb') as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(block)
+            else:
+                stat = os.stat(name)
+                digest.update(f":{stat.st_size}:{stat.st_mtime_ns}".encode())
+        except OSError:
+            digest.update(b":missing")
+    return digest.hexdigest()
+
+def read_stamp(session_dir):
+    try:
+        with open(os.path.join(session_dir, STAMP_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def generate_summary(session_dir, steps):
+    """Summarize a session, reusing cached chunk summaries; None if it failed"""
+    try:
+        for start in range(0, len(steps) - CHUNK_SIZE + 1, CHUNK_SIZE):
+            summarize_chunk(session_dir, steps[start:start + CHUNK_SIZE], start + 1)
+        return "".join(stream_summary(build_session_prompt(session_dir, steps))).strip()
+    except Exception as e:
+        print(f"{os.path.basename(session_dir)}: error generating summary: {e}", file=sys.stderr)
+        return None
+
+def export_session(session_dir, summarize=True, use_hash=False, force=False):
+    """Export one session folder (runs in a worker process).
+
+    Returns (status, seconds) where status is "exported" or "skipped".
+    """
+    start = time.perf_counter()
+    steps = [step_record(step) for step in read_session_steps(session_dir)]
+    # Screenshot paths are relative to where the recorder ran; use the folder's own
+    for step in steps:
+        step['screenshot'] = os.path.join(session_dir, os.path.basename(step['screenshot']))
+
+    inputs = session_inputs(session_dir, steps, use_hash)
+    summary_path = os.path.join(session_dir, SUMMARY_FILE)
+    stamp = read_stamp(session_dir)
+    if (not force and stamp and stamp.get("inputs") == inputs and
+            stamp.get("version") == EXPORT_VERSION and
+            (stamp.get("summary") or not summarize) and
+            os.path.exists(os.path.join(session_dir, "report.html"))):
+        return "skipped", time.perf_counter() - start
+
+    # Thumbnails and image sizes missing from older sessions
+    for step in steps:
+        thumb = thumbnail_path(step['screenshot'])
+        has_thumb = os.path.exists(thumb)
+        if not os.path.exists(step['screenshot']) or (has_thumb and 'size' in step):
+            continue
+        with Image.open(step['screenshot']) as img:
+            step['size'] = img.size
+            if not has_thumb:
+                os.makedirs(os.path.dirname(thumb), exist_ok=True)
+                make_thumbnail(img.convert('RGB')).save(thumb, format="PNG", compress_level=1)
+
+    summary = None
+    if summarize and steps:
+        summary = generate_summary(session_dir, steps)
+        if summary:
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                f.write(summary)
+    if summary is None and os.path.exists(summary_path):
+        with open(summary_path, 'r', encoding='utf-8') as f:
+            summary = f.read()
+
+    write_report(os.path.join(session_dir, "report.html"), steps,
+                 summary or "No summary available")
+
+    # steps_data.json is an input for sessions recorded before the journal
+    if os.path.exists(journal_path(session_dir)):
+        with open(os.path.join(session_dir, "steps_data.json"), 'w') as f:
+            json.dump(steps, f)
+
+    with open(os.path.join(session_dir, STAMP_FILE), 'w', encoding='utf-8') as f:
+        json.dump({"version": EXPORT_VERSION, "inputs": inputs, "summary": bool(summary)}, f)
+    return "exported", time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sessions", nargs="*", help="session folders (default: recordings/session_*)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--no-summary", action="store_true", help="don't call the LLM")
+    parser.add_argument("--hash", action="store_true",
+                        help="detect changes by content hash instead of size and mtime")
+    parser.add_argument("--force", action="store_true", help="export even if up to date")
+    args = parser.parse_args()
+
+    sessions = args.sessions or sorted(glob.glob(os.path.join("recordings", "session_*")))
+    sessions = [path for path in sessions if os.path.isdir(path)]
+    if not sessions:
+        print("No session folders found")
+        return 0
+
+    start = time.perf_counter()
+    counts = {"exported": 0, "skipped": 0, "failed": 0}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(export_session, path, not args.no_summary, args.hash, args.force): path
+                   for path in sessions}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                status, seconds = future.result()
+            except Exception as e:
+                counts["failed"] += 1
+                print(f"{path}: failed: {e}", file=sys.stderr)
+                continue
+            counts[status] += 1
+            if status == "exported":
+                print(f"{path}: exported in {seconds:.1f} s")
+
+    print(f"{counts['exported']} exported, {counts['skipped']} up to date, "
+          f"{counts['failed']} failed in {time.perf_counter() - start:.1f} s")
+
+    # Pick up new summaries in the search index
+    for output_dir in sorted({os.path.dirname(os.path.abspath(path)) for path in sessions}):
+        try:
+            index = SearchIndex(output_dir)
+            index.sync()
+            index.close()
+        except Exception as e:
+            print(f"Error updating search index in {output_dir}: {e}", file=sys.stderr)
+
+    return 1 if counts["failed"] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,369 @@
+# handdetect.py
+import time
+import cv2
+import numpy as np
+
+class StageTimer:
+    """Collects per-stage wall times for HandDetector (used by benchmarks)"""
+    def __init__(self):
+        self.samples = {}  # stage name -> list of per-frame seconds
+        self._frame = {}
+        self._last = None
+
+    def begin_frame(self):
+        self._frame = {}
+
+    def end_frame(self):
+        """Store the stage totals of the current frame"""
+        for stage, seconds in self._frame.items():
+            self.samples.setdefault(stage, []).append(seconds)
+        self._frame = {}
+
+    def start(self):
+        self._last = time.perf_counter()
+
+    def mark(self, stage):
+        """Add the time since start() or the previous mark to stage"""
+        now = time.perf_counter()
+        self._frame[stage] = self._frame.get(stage, 0.0) + now - self._last
+        self._last = now
+
+class HandDetector:
+    """Skin-colour hand detection restricted to a zone of the camera frame.
+
+    Only depends on OpenCV and numpy so it can run on a worker thread
+    (or headless) without touching any Qt widgets.
+    """
+    # Skin color range (tuned to avoid brown backgrounds)
+    LOWER_SKIN = np.array([0, 30, 60], dtype=np.uint8)
+    UPPER_SKIN = np.array([20, 150, 255], dtype=np.uint8)
+
+    # Morphology kernel used to reduce noise
+    KERNEL = np.ones((5, 5), np.uint8)
+
+    # Hand contour area limits in pixels at native resolution
+    MIN_HAND_AREA = 8000
+    MAX_HAND_AREA = 50000
+
+    # Zero border kept around zone edges that lie inside the frame. The
+    # erode (2px), two dilates (4px) and blur (2px) reach at most 8px, so
+    # with this much padding the cropped pipeline sees exactly what the
+    # full-frame pipeline saw beyond the zone: nothing.
+    ZONE_PADDING = 8
+
+    # Tracking window: last hand box grown by this fraction of its size on
+    # each side, with width/height rounded up to TRACK_GRID pixels so a
+    # moving window keeps hitting the same cached buffers
+    TRACK_MARGIN = 0.5
+    TRACK_GRID = 32
+
+    # Distinct buffer shapes kept before the cache is flushed
+    MAX_CACHED_BUFFERS = 8
+
+    def __init__(self, zone="bottom", analysis_scale=1.0, smoothing=0.4):
+        # Detection zone (only detect in bottom half of frame)
+        self.zone = zone  # "bottom", "left", "right", "full"
+
+        # Detection runs on the zone downscaled by this factor (e.g. 0.5)
+        self.analysis_scale = analysis_scale
+
+        # Search around the last hand first, fall back to the whole zone
+        self.tracking = True
+        # Exponential smoothing of the hand center: weight of the previous
+        # position, 0 = raw detections
+        self.smoothing = smoothing
+        self._last_box = None
+        self._smoothed = None
+
+        # How often the tracking window was enough vs a full-zone search
+        self.search_stats = {"window": 0, "zone": 0}
+
+        # Optional StageTimer; stays None outside of benchmarks
+        self.stage_timer = None
+
+        # Scratch images keyed by analysed shape and padding
+        self._buffer_cache = {}
+
+    def get_zone_rect(self, frame_shape):
+        """Return the detection zone as (x0, y0, x1, y1)"""
+        h, w = frame_shape[:2]
+
+        if self.zone == "bottom":
+            # Bottom half only
+            return (0, h//2, w, h)
+        elif self.zone == "left":
+            # Left third
+            return (0, 0, w//3, h)
+        elif self.zone == "right":
+            # Right third
+            return (2*w//3, 0, w, h)
+        else:
+            # Full frame
+            return (0, 0, w, h)
+
+    def _get_buffers(self, frame_shape, rect, scale):
+        """Return (buffers, origin, scale_x, scale_y) for analysing rect.
+
+        Scratch images are cached by shape and padding, so they are reused
+        across frames and by a tracking window that moves around.
+        """
+        h, w = frame_shape[:2]
+        x0, y0, x1, y1 = rect
+        rect_h, rect_w = y1 - y0, x1 - x0
+        if scale != 1.0:
+            rect_h = max(1, round(rect_h * scale))
+            rect_w = max(1, round(rect_w * scale))
+
+        pad = self.ZONE_PADDING
+        pad_left = pad if x0 > 0 else 0
+        pad_top = pad if y0 > 0 else 0
+        pad_right = pad if x1 < w else 0
+        pad_bottom = pad if y1 < h else 0
+
+        key = (rect_h, rect_w, pad_left, pad_top, pad_right, pad_bottom, scale != 1.0)
+        buffers = self._buffer_cache.get(key)
+        if buffers is None:
+            if len(self._buffer_cache) >= self.MAX_CACHED_BUFFERS:
+                self._buffer_cache.clear()
+            padded_shape = (rect_h + pad_top + pad_bottom, rect_w + pad_left + pad_right)
+
+            # Only the inner view of "padded" is ever written, so its
+            # border stays zero across frames
+            padded = np.zeros(padded_shape, dtype=np.uint8)
+            buffers = {
+                "small": np.empty((rect_h, rect_w, 3), dtype=np.uint8) if scale != 1.0 else None,
+                "hsv": np.empty((rect_h, rect_w, 3), dtype=np.uint8),
+                "padded": padded,
+                "skin": padded[pad_top:pad_top + rect_h, pad_left:pad_left + rect_w],
+                "tmp1": np.empty(padded_shape, dtype=np.uint8),
+                "tmp2": np.empty(padded_shape, dtype=np.uint8),
+            }
+            self._buffer_cache[key] = buffers
+
+        if scale == 1.0:
+            # Full-frame position of padded[0, 0]
+            origin = (x0 - pad_left, y0 - pad_top)
+        else:
+            # Keep contours in analysis pixels relative to rect; results
+            # are mapped back to the frame afterwards
+            origin = (-pad_left, -pad_top)
+
+        # Analysis pixels per frame pixel along each axis
+        return buffers, origin, rect_w / (x1 - x0), rect_h / (y1 - y0)
+
+    def process_frame(self, frame, annotate=True):
+        """Flip a raw camera frame, run detection and optionally annotate it.
+
+        Returns (frame, hand_center); hand_center is None when no hand was
+        found in the zone. Annotations are drawn after detection so they
+        never feed back into it, and can be skipped when nobody looks at
+        the preview.
+        """
+        timer = self.stage_timer
+        if timer:
+            timer.start()
+
+        # Flip frame
+        frame = cv2.flip(frame, 1)
+        if timer:
+            timer.mark("flip")
+
+        # Detect hand in zone
+        zone_rect = self.get_zone_rect(frame.shape)
+        hand_center = self.track_hand(frame, zone_rect)
+
+        if annotate:
+            if timer:
+                timer.start()
+            self.annotate_frame(frame, zone_rect, hand_center)
+            if timer:
+                timer.mark("annotate")
+
+        return frame, hand_center
+
+    def annotate_frame(self, frame, zone_rect, hand_center):
+        """Draw the detection zone and hand status onto frame in place"""
+        # Draw detection zone
+        cv2.rectangle(frame, (zone_rect[0], zone_rect[1]),
+                     (zone_rect[2], zone_rect[3]), (0, 255, 0), 2)
+        cv2.putText(frame, "Detection Zone", (zone_rect[0] + 10, zone_rect[1] + 30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+        if hand_center:
+            # Draw circle at hand center
+            cv2.circle(frame, hand_center, 15, (0, 255, 0), -1)
+            cv2.putText(frame, "Hand Detected", (10, 30),
+                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        else:
+            cv2.putText(frame, "Show hand in green zone", (10, 30),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+
+    def reset_tracking(self):
+        """Forget the last hand position (e.g. when tracking restarts)"""
+        self._last_box = None
+        self._smoothed = None
+
+    def track_hand(self, frame, zone_rect):
+        """Return the smoothed hand center, searching near the last one first.
+
+        A full-zone search only happens when there is no previous hand or
+        it was not found (cleanly) inside the tracking window.
+        """
+        found = None
+        if self.tracking and self._last_box is not None:
+            window = self._search_window(zone_rect, self._last_box)
+            if window != zone_rect:
+                found = self._find_hand(frame, window)
+                if found and self._touches_window_edge(found[1], window, zone_rect):
+                    # Hand continues past the window, the blob is clipped
+                    found = None
+                if found:
+                    self.search_stats["window"] += 1
+
+        if found is None:
+            found = self._find_hand(frame, zone_rect)
+            self.search_stats["zone"] += 1
+
+        if found is None:
+            self.reset_tracking()
+            return None
+
+        (cx, cy), self._last_box = found
+        if self._smoothed is None or not self.smoothing:
+            self._smoothed = (cx, cy)
+        else:
+            a = self.smoothing
+            sx, sy = self._smoothed
+            self._smoothed = (a * sx + (1 - a) * cx, a * sy + (1 - a) * cy)
+        return (int(round(self._smoothed[0])), int(round(self._smoothed[1])))
+
+    def _search_window(self, zone_rect, box):
+        """Grid-sized window around the last hand box, kept inside the zone"""
+        zx0, zy0, zx1, zy1 = zone_rect
+        bx0, by0, bx1, by1 = box
+        grid = self.TRACK_GRID
+        margin = int(max(bx1 - bx0, by1 - by0) * self.TRACK_MARGIN)
+
+        win_w = -(-(bx1 - bx0 + 2 * margin) // grid) * grid
+        win_h = -(-(by1 - by0 + 2 * margin) // grid) * grid
+        win_w = min(win_w, zx1 - zx0)
+        win_h = min(win_h, zy1 - zy0)
+
+        # Center on the box, shifted back inside the zone where needed
+        x0 = min(max((bx0 + bx1) // 2 - win_w // 2, zx0), zx1 - win_w)
+        y0 = min(max((by0 + by1) // 2 - win_h // 2, zy0), zy1 - win_h)
+        return (x0, y0, x0 + win_w, y0 + win_h)
+
+    def _touches_window_edge(self, box, window, zone_rect):
+        """True if box reaches a window edge that is not also a zone edge"""
+        # Blobs grow up to ZONE_PADDING analysis pixels past their source
+        reach = int(np.ceil(self.ZONE_PADDING / self.analysis_scale))
+        bx0, by0, bx1, by1 = box
+        wx0, wy0, wx1, wy1 = window
+        zx0, zy0, zx1, zy1 = zone_rect
+        return ((wx0 > zx0 and bx0 <= wx0 + reach) or
+                (wy0 > zy0 and by0 <= wy0 + reach) or
+                (wx1 < zx1 and bx1 >= wx1 - reach) or
+                (wy1 < zy1 and by1 >= wy1 - reach))
+
+    def detect_hand_in_zone(self, frame, zone_rect):
+        """Detect hand only in specified zone (no tracking or smoothing)"""
+        found = self._find_hand(frame, zone_rect)
+        return found[0] if found else None
+
+    def _find_hand(self, frame, rect):
+        """Detect the hand inside rect.
+
+        Only that region of the frame is converted and filtered; contour
+        coordinates are mapped back to the full frame. With an
+        analysis_scale below 1 the region is downscaled first and the
+        area limits shrink to match. Returns ((cx, cy), (x0, y0, x1, y1))
+        with the hand center and bounding box, or None.
+        """
+        timer = self.stage_timer
+        if timer:
+            timer.start()
+
+        scale = self.analysis_scale
+        buffers, origin, scale_x, scale_y = self._get_buffers(frame.shape, rect, scale)
+        x0, y0, x1, y1 = rect
+        tmp1 = buffers["tmp1"]
+        tmp2 = buffers["tmp2"]
+
+        # Slicing the region is a view, no copy
+        region = frame[y0:y1, x0:x1]
+        if buffers["small"] is not None:
+            small = buffers["small"]
+            cv2.resize(region, (small.shape[1], small.shape[0]), dst=small,
+                       interpolation=cv2.INTER_AREA)
+            region = small
+            if timer:
+                timer.mark("resize")
+
+        # Convert region to HSV
+        cv2.cvtColor(region, cv2.COLOR_BGR2HSV, dst=buffers["hsv"])
+        if timer:
+            timer.mark("cvtColor")
+
+        # Create skin mask inside the zero-padded buffer
+        cv2.inRange(buffers["hsv"], self.LOWER_SKIN, self.UPPER_SKIN, dst=buffers["skin"])
+        if timer:
+            timer.mark("inRange")
+
+        # Morphological operations to reduce noise
+        cv2.erode(buffers["padded"], self.KERNEL, dst=tmp1, iterations=1)
+        cv2.dilate(tmp1, self.KERNEL, dst=tmp2, iterations=2)
+        cv2.GaussianBlur(tmp2, (5, 5), 0, dst=tmp1)
+        if timer:
+            timer.mark("morphology")
+
+        # Find contours (in full-frame coordinates at native scale)
+        contours, _ = cv2.findContours(tmp1, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                       offset=origin)
+        if timer:
+            timer.mark("findContours")
+
+        # Area limits scale with the number of analysed pixels
+        min_area = self.MIN_HAND_AREA * scale_x * scale_y
+        max_area = self.MAX_HAND_AREA * scale_x * scale_y
+
+        if contours:
+            # Filter contours by area and shape
+            valid_contours = []
+            for contour in contours:
+                area = cv2.contourArea(contour)
+                # Hand should be reasonably large but not too large (face)
+                if min_area < area < max_area:
+                    # Check if contour is somewhat vertical (hand-like)
+                    x, y, w, h = cv2.boundingRect(contour)
+                    aspect_ratio = h / w if w > 0 else 0
+
+                    # Hand is usually taller than wide
+                    if 0.8 < aspect_ratio < 3.0:
+                        valid_contours.append(contour)
+
+            if timer:
+                timer.mark("filter")
+
+            if valid_contours:
+                # Get largest valid contour
+                largest_contour = max(valid_contours, key=cv2.contourArea)
+
+                # Get center
+                M = cv2.moments(largest_contour)
+                if timer:
+                    timer.mark("moments")
+                if M["m00"] != 0:
+                    cx = M["m10"] / M["m00"]
+                    cy = M["m01"] / M["m00"]
+                    bx, by, bw, bh = cv2.boundingRect(largest_contour)
+                    box = (bx, by, bx + bw, by + bh)
+                    if scale != 1.0:
+                        # Map analysis pixels back to the full frame
+                        cx = x0 + cx / scale_x
+                        cy = y0 + cy / scale_y
+                        box = (int(x0 + box[0] / scale_x), int(y0 + box[1] / scale_y),
+                               int(x0 + box[2] / scale_x), int(y0 + box[3] / scale_y))
+                    return (int(cx), int(cy)), box
+
+        return None
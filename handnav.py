@@ -1,11 +1,330 @@
 # handnav.py
+import threading
+import time
+from collections import deque
 import cv2
 import pyautogui
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                                QLabel, QComboBox, QCheckBox)
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QThread, Signal, QEvent, QSettings, QTimer
 from PySide6.QtGui import QImage, QPixmap
-import numpy as np
+from handdetect import HandDetector
+
+# Capture backends offered in the camera settings (cv2.CAP_ANY = driver default)
+CAMERA_BACKENDS = {
+    "Auto": cv2.CAP_ANY,
+    "DirectShow": cv2.CAP_DSHOW,
+    "Media Foundation": cv2.CAP_MSMF,
+    "V4L2": cv2.CAP_V4L2,
+    "AVFoundation": cv2.CAP_AVFOUNDATION,
+}
+
+DEFAULT_CAMERA_SETTINGS = {
+    "device": 0,
+    "backend": "Auto",
+    "resolution": "Default",  # "Default" or "WIDTHxHEIGHT"
+    "fps": 0,                 # 0 = driver default
+    "fourcc": "Default",      # "Default", "MJPG", "YUY2", ...
+    "low_latency": True,      # CAP_PROP_BUFFERSIZE = 1
+}
+
+def open_camera(settings):
+    """Open a cv2.VideoCapture configured from camera settings"""
+    cap = cv2.VideoCapture(int(settings["device"]), CAMERA_BACKENDS.get(settings["backend"], cv2.CAP_ANY))
+    if not cap.isOpened():
+        return cap
+    
+    # FOURCC first: some backends only accept larger sizes once the
+    # compressed format is selected
+    if settings["fourcc"] != "Default":
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*settings["fourcc"]))
+    if settings["resolution"] != "Default":
+        width, height = settings["resolution"].split("x")
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(width))
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(height))
+    if settings["fps"]:
+        cap.set(cv2.CAP_PROP_FPS, int(settings["fps"]))
+    if settings["low_latency"]:
+        # Not every backend supports this; it is a no-op where it doesn't
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+def describe_camera(cap):
+    """Human-readable summary of what the driver actually negotiated"""
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    fourcc_text = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip("\0 ") or "?"
+    return (f"{int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x{int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}"
+            f" @ {cap.get(cv2.CAP_PROP_FPS):.0f} fps {fourcc_text}")
+
+class LatestSlot:
+    """Single-value mailbox that only ever keeps the newest item"""
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._value = None
+    
+    def put(self, value):
+        """Store value, dropping any unread one. Returns True if one was dropped."""
+        with self._cond:
+            dropped = self._value is not None
+            self._value = value
+            self._cond.notify()
+        return dropped
+    
+    def take(self, timeout=None):
+        """Return and clear the current value, waiting up to timeout for one"""
+        with self._cond:
+            if self._value is None and timeout:
+                self._cond.wait(timeout)
+            value, self._value = self._value, None
+        return value
+
+
+class ScrollDispatcher:
+    """Injects scroll events from its own thread at a bounded rate.
+    
+    push() only adds to a pending total and never blocks the caller.
+    The dispatcher coalesces everything pending into a single
+    pyautogui.scroll call at most max_events_per_sec times a second,
+    amplified when the hand is moving fast.
+    """
+    def __init__(self, max_events_per_sec=30):
+        self.max_events_per_sec = max_events_per_sec
+        
+        # Velocity acceleration: above accel_threshold scroll units/s the
+        # gain grows by `acceleration` per multiple of the threshold
+        self.acceleration = 0.5
+        self.accel_threshold = 2000.0
+        self.max_gain = 3.0
+        
+        self._cond = threading.Condition()
+        self._pending = 0.0
+        self._oldest_capture = None
+        self._running = False
+        self._thread = None
+        
+        # Seconds from camera frame delivery to scroll injection
+        self.latencies = deque(maxlen=120)
+    
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._pending = 0.0
+            self._oldest_capture = None
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+    
+    def push(self, amount, captured_at=None):
+        """Queue a scroll amount; returns immediately.
+        
+        captured_at is the time.monotonic() at which the camera frame that
+        caused it was delivered, used for the latency readout.
+        """
+        with self._cond:
+            self._pending += amount
+            if captured_at is not None and self._oldest_capture is None:
+                self._oldest_capture = captured_at
+            self._cond.notify()
+    
+    def latency_stats(self):
+        """Return (mean_ms, p95_ms) of recent frame-to-scroll latency, or None"""
+        samples = sorted(self.latencies)
+        if not samples:
+            return None
+        mean = sum(samples) / len(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return mean * 1000, p95 * 1000
+    
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+            
+            # Rate limit: let more deltas coalesce until the next slot
+            interval = 1.0 / self.max_events_per_sec
+            wait = last_flush + interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            
+            now = time.monotonic()
+            with self._cond:
+                total, self._pending = self._pending, 0.0
+                captured_at, self._oldest_capture = self._oldest_capture, None
+            
+            velocity = abs(total) / max(now - last_flush, interval)
+            gain = min(self.max_gain,
+                       1.0 + self.acceleration * max(0.0, velocity / self.accel_threshold - 1.0))
+            amount = int(total * gain)
+            
+            last_flush = now
+            if amount:
+                # Carry the rounded-off fraction into the next event
+                with self._cond:
+                    self._pending += total - amount / gain
+                try:
+                    pyautogui.scroll(amount)
+                except Exception as e:
+                    print(f"Error scrolling: {e}")
+                if captured_at is not None:
+                    self.latencies.append(time.monotonic() - captured_at)
+
+
+class HandTrackingWorker(QThread):
+    """Reads the camera and runs hand detection off the GUI thread.
+    
+    A capture thread keeps only the newest camera frame, this thread
+    processes it, and the GUI is notified through frame_ready and pulls
+    the latest result with take_result(). Stale frames and results are
+    dropped instead of queueing up.
+    
+    Frames are paced by the camera itself: cap.read() blocks until the
+    next frame, and a frame that arrives while the previous one is still
+    being processed simply replaces it. When no hand has been seen for
+    idle_after seconds the worker drops to idle_fps, draining the camera
+    with grab() (no decode) in between, and returns to full rate as soon
+    as a hand shows up again.
+    """
+    frame_ready = Signal()
+    idle_changed = Signal(bool)
+    
+    def __init__(self, cap, detector):
+        super().__init__()
+        self.cap = cap
+        self.detector = detector
+        self.running = False
+        self._frames = LatestSlot()
+        self._results = LatestSlot()
+        self._capture_thread = None
+        
+        # Preview settings, written from the GUI thread
+        self.preview_size = None      # (width, height) available in the preview label
+        self.preview_interval = 0.0   # seconds between previews, None = no preview
+        self._last_preview = 0.0
+        self._fit_key = None
+        self._fit_size = None
+        
+        # Low-power idle when no hand is visible
+        self.idle_enabled = True
+        self.idle_after = 3.0   # seconds without a hand before idling
+        self.idle_fps = 5
+        self.idle = False
+        self._last_hand_time = time.monotonic()
+        
+        # Measured camera delivery rate
+        self.camera_fps = 0.0
+    
+    def start(self, *args):
+        # Set before the thread runs, so a stop() that comes first isn't lost
+        self.running = True
+        super().start(*args)
+    
+    def run(self):
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+        
+        while self.running:
+            item = self._frames.take(timeout=0.1)
+            if item is None:
+                continue
+            frame, captured_at = item
+            
+            now = time.monotonic()
+            interval = self.preview_interval
+            want_preview = (interval is not None and self.preview_size is not None
+                            and now - self._last_preview >= interval)
+            
+            try:
+                frame, hand_center = self.detector.process_frame(frame, annotate=want_preview)
+                preview = self._make_preview(frame) if want_preview else None
+            except Exception as e:
+                print(f"Error processing frame: {e}")
+                continue
+            
+            if want_preview:
+                self._last_preview = now
+            result = (preview, hand_center, frame.shape, captured_at)
+            self._update_idle(hand_center is not None, now)
+            
+            # Only signal when the GUI has consumed the previous result
+            if not self._results.put(result):
+                self.frame_ready.emit()
+        
+        # The camera is released once wait() returns, so the reader must be done
+        self._capture_thread.join()
+    
+    def _update_idle(self, hand_seen, now):
+        """Switch between full rate and idle rate based on hand presence"""
+        if hand_seen:
+            self._last_hand_time = now
+        idle = self.idle_enabled and now - self._last_hand_time > self.idle_after
+        if idle != self.idle:
+            self.idle = idle
+            self.idle_changed.emit(idle)
+    
+    def _capture_loop(self):
+        next_frame_time = 0.0
+        last_capture = 0.0
+        while self.running:
+            if self.idle:
+                # Keep the driver buffer fresh without decoding frames
+                # we are not going to process
+                now = time.monotonic()
+                if now < next_frame_time:
+                    if not self.cap.grab():
+                        # Camera gone or not ready; don't spin on it
+                        time.sleep(0.01)
+                    continue
+                next_frame_time = now + 1.0 / self.idle_fps
+            
+            ret, frame = self.cap.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+            captured_at = time.monotonic()
+            
+            if not self.idle and last_capture:
+                rate = 1.0 / max(captured_at - last_capture, 1e-6)
+                self.camera_fps = rate if not self.camera_fps else 0.9 * self.camera_fps + 0.1 * rate
+            last_capture = captured_at
+            self._frames.put((frame, captured_at))
+    
+    def _make_preview(self, frame):
+        """Shrink frame to fit the preview label, keeping its aspect ratio"""
+        h, w = frame.shape[:2]
+        key = (h, w, self.preview_size)
+        if self._fit_key != key:
+            # Only recomputed when the frame or label size changes
+            label_w, label_h = self.preview_size
+            factor = min(label_w / w, label_h / h)
+            self._fit_size = (max(1, int(w * factor)), max(1, int(h * factor)))
+            self._fit_key = key
+        
+        if self._fit_size == (w, h):
+            return frame
+        return cv2.resize(frame, self._fit_size, interpolation=cv2.INTER_AREA)
+    
+    def take_result(self):
+        """Return the newest (preview, hand_center, frame_shape, captured_at) result, or None.
+        
+        preview is None for frames that were not picked for display.
+        """
+        return self._results.take()
+    
+    def stop(self):
+        self.running = False
+        if self._capture_thread:
+            self._capture_thread.join()
+        self.wait()
 
 class HandNavigationWindow(QWidget):
     def __init__(self):
@@ -17,9 +336,22 @@ class HandNavigationWindow(QWidget):
         self.scroll_sensitivity = 20
         self.prev_y = None
         self.scroll_threshold = 0.02
+        self.scroll_dispatcher = ScrollDispatcher()
+        
+        # Hand detection runs on the worker thread
+        self.detector = HandDetector()
+        self.worker = None
+        
+        # Seconds between preview frames (0 = every frame, None = off)
+        self.preview_interval = 0.0
         
-        # Detection zone (only detect in bottom half of frame)
-        self.detection_zone = "bottom"  # "bottom", "left", "right", "full"
+        # Persisted camera backend settings
+        self.settings = QSettings("Bubble", "HandNavigation")
+        self.camera_settings = self.load_camera_settings()
+        
+        # Refreshes the latency readout while tracking
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update_latency_label)
         
         self.initUI()
         
@@ -91,6 +423,122 @@ class HandNavigationWindow(QWidget):
         sensitivity_layout.addStretch()
         layout.addLayout(sensitivity_layout)
         
+        # Maximum scroll events injected per second
+        rate_layout = QHBoxLayout()
+        rate_label = QLabel("Max Scroll Events:")
+        rate_label.setStyleSheet("font-size: 14px;")
+        rate_layout.addWidget(rate_label)
+        
+        self.rate_combo = QComboBox()
+        self.rate_combo.addItems(["15 / sec", "30 / sec", "60 / sec"])
+        self.rate_combo.setCurrentIndex(1)
+        self.rate_combo.currentTextChanged.connect(self.on_scroll_rate_changed)
+        rate_layout.addWidget(self.rate_combo)
+        rate_layout.addStretch()
+        layout.addLayout(rate_layout)
+        
+        # Analysis resolution (preview stays at full resolution)
+        resolution_layout = QHBoxLayout()
+        resolution_label = QLabel("Analysis Resolution:")
+        resolution_label.setStyleSheet("font-size: 14px;")
+        resolution_layout.addWidget(resolution_label)
+        
+        self.resolution_combo = QComboBox()
+        self.resolution_combo.addItems(["Full", "1/2 (faster)", "1/4 (fastest)"])
+        self.resolution_combo.currentTextChanged.connect(self.on_resolution_changed)
+        resolution_layout.addWidget(self.resolution_combo)
+        resolution_layout.addStretch()
+        layout.addLayout(resolution_layout)
+        
+        # Smoothing of the tracked hand position
+        smoothing_layout = QHBoxLayout()
+        smoothing_label = QLabel("Motion Smoothing:")
+        smoothing_label.setStyleSheet("font-size: 14px;")
+        smoothing_layout.addWidget(smoothing_label)
+        
+        self.smoothing_combo = QComboBox()
+        self.smoothing_combo.addItems(["Off", "Light", "Strong"])
+        self.smoothing_combo.setCurrentIndex(1)
+        self.smoothing_combo.currentTextChanged.connect(self.on_smoothing_changed)
+        smoothing_layout.addWidget(self.smoothing_combo)
+        smoothing_layout.addStretch()
+        layout.addLayout(smoothing_layout)
+        
+        # Preview rate (preview is paused automatically while minimized)
+        preview_layout = QHBoxLayout()
+        preview_label = QLabel("Camera Preview:")
+        preview_label.setStyleSheet("font-size: 14px;")
+        preview_layout.addWidget(preview_label)
+        
+        self.preview_combo = QComboBox()
+        self.preview_combo.addItems(["Every Frame", "15 fps", "5 fps", "Off"])
+        self.preview_combo.currentTextChanged.connect(self.on_preview_changed)
+        preview_layout.addWidget(self.preview_combo)
+        preview_layout.addStretch()
+        layout.addLayout(preview_layout)
+        
+        # Low-power idle
+        self.idle_checkbox = QCheckBox("Power saving: slow down to 5 fps when no hand is seen for 3 s")
+        self.idle_checkbox.setChecked(True)
+        self.idle_checkbox.setStyleSheet("font-size: 13px;")
+        self.idle_checkbox.toggled.connect(self.on_idle_toggled)
+        layout.addWidget(self.idle_checkbox)
+        
+        # Camera backend settings (applied on next start)
+        camera_layout = QHBoxLayout()
+        camera_label = QLabel("Camera:")
+        camera_label.setStyleSheet("font-size: 14px;")
+        camera_layout.addWidget(camera_label)
+        
+        self.device_combo = QComboBox()
+        self.device_combo.addItems(["0", "1", "2", "3"])
+        self.device_combo.setCurrentText(str(self.camera_settings["device"]))
+        camera_layout.addWidget(self.device_combo)
+        
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItems(list(CAMERA_BACKENDS))
+        self.backend_combo.setCurrentText(self.camera_settings["backend"])
+        camera_layout.addWidget(self.backend_combo)
+        camera_layout.addStretch()
+        layout.addLayout(camera_layout)
+        
+        capture_layout = QHBoxLayout()
+        capture_label = QLabel("Capture:")
+        capture_label.setStyleSheet("font-size: 14px;")
+        capture_layout.addWidget(capture_label)
+        
+        self.capture_resolution_combo = QComboBox()
+        self.capture_resolution_combo.addItems(["Default", "640x480", "1280x720", "1920x1080"])
+        self.capture_resolution_combo.setCurrentText(self.camera_settings["resolution"])
+        capture_layout.addWidget(self.capture_resolution_combo)
+        
+        self.fps_combo = QComboBox()
+        self.fps_combo.addItems(["Default fps", "30 fps", "60 fps"])
+        self.fps_combo.setCurrentText(f"{self.camera_settings['fps']} fps" if self.camera_settings["fps"] else "Default fps")
+        capture_layout.addWidget(self.fps_combo)
+        
+        self.fourcc_combo = QComboBox()
+        self.fourcc_combo.addItems(["Default", "MJPG", "YUY2"])
+        self.fourcc_combo.setCurrentText(self.camera_settings["fourcc"])
+        capture_layout.addWidget(self.fourcc_combo)
+        capture_layout.addStretch()
+        layout.addLayout(capture_layout)
+        
+        self.low_latency_checkbox = QCheckBox("Low-latency capture (1-frame driver buffer)")
+        self.low_latency_checkbox.setChecked(self.camera_settings["low_latency"])
+        self.low_latency_checkbox.setStyleSheet("font-size: 13px;")
+        layout.addWidget(self.low_latency_checkbox)
+        
+        for combo in [self.device_combo, self.backend_combo, self.capture_resolution_combo,
+                      self.fps_combo, self.fourcc_combo]:
+            combo.currentTextChanged.connect(self.on_camera_setting_changed)
+        self.low_latency_checkbox.toggled.connect(self.on_camera_setting_changed)
+        
+        # Measured latency
+        self.latency_label = QLabel("Latency: -")
+        self.latency_label.setStyleSheet("font-size: 12px; color: #aaa;")
+        layout.addWidget(self.latency_label)
+        
         # Instructions
         instructions = QLabel(
             "📌 Instructions:\n"
@@ -169,14 +617,14 @@ class HandNavigationWindow(QWidget):
     def on_zone_changed(self, value):
         """Update detection zone"""
         if "Bottom" in value:
-            self.detection_zone = "bottom"
+            self.detector.zone = "bottom"
         elif "Left" in value:
-            self.detection_zone = "left"
+            self.detector.zone = "left"
         elif "Right" in value:
-            self.detection_zone = "right"
+            self.detector.zone = "right"
         else:
-            self.detection_zone = "full"
-        print(f"Detection zone: {self.detection_zone}")
+            self.detector.zone = "full"
+        print(f"Detection zone: {self.detector.zone}")
         
     def on_sensitivity_changed(self, value):
         if value == "Low":
@@ -187,16 +635,130 @@ class HandNavigationWindow(QWidget):
             self.scroll_sensitivity = 30
         print(f"Scroll sensitivity: {value} ({self.scroll_sensitivity})")
     
+    def load_camera_settings(self):
+        """Read camera settings from QSettings, falling back to defaults"""
+        settings = dict(DEFAULT_CAMERA_SETTINGS)
+        for key, default in DEFAULT_CAMERA_SETTINGS.items():
+            settings[key] = self.settings.value(f"camera/{key}", default, type=type(default))
+        return settings
+    
+    def on_camera_setting_changed(self, *args):
+        """Store camera settings; they are applied on the next start"""
+        fps_text = self.fps_combo.currentText()
+        self.camera_settings = {
+            "device": int(self.device_combo.currentText()),
+            "backend": self.backend_combo.currentText(),
+            "resolution": self.capture_resolution_combo.currentText(),
+            "fps": int(fps_text.split()[0]) if fps_text[0].isdigit() else 0,
+            "fourcc": self.fourcc_combo.currentText(),
+            "low_latency": self.low_latency_checkbox.isChecked(),
+        }
+        for key, value in self.camera_settings.items():
+            self.settings.setValue(f"camera/{key}", value)
+        print(f"Camera settings: {self.camera_settings}")
+    
+    def update_latency_label(self):
+        """Show measured frame-to-scroll latency and camera rate"""
+        if not self.worker:
+            return
+        
+        text = f"Camera: {self.camera_description} ({self.worker.camera_fps:.1f} fps measured)"
+        stats = self.scroll_dispatcher.latency_stats()
+        if stats:
+            text += f"  |  Frame→scroll latency: {stats[0]:.0f} ms avg, {stats[1]:.0f} ms p95"
+        self.latency_label.setText(text)
+    
+    def on_scroll_rate_changed(self, value):
+        """Update the scroll event rate limit"""
+        self.scroll_dispatcher.max_events_per_sec = int(value.split()[0])
+        print(f"Max scroll events: {value}")
+    
+    def on_resolution_changed(self, value):
+        """Update the scale hand detection runs at"""
+        if value.startswith("1/2"):
+            self.detector.analysis_scale = 0.5
+        elif value.startswith("1/4"):
+            self.detector.analysis_scale = 0.25
+        else:
+            self.detector.analysis_scale = 1.0
+        print(f"Analysis resolution: {value} ({self.detector.analysis_scale})")
+    
+    def on_smoothing_changed(self, value):
+        """Update how strongly the hand position is smoothed"""
+        if value == "Off":
+            self.detector.smoothing = 0.0
+        elif value == "Strong":
+            self.detector.smoothing = 0.7
+        else:
+            self.detector.smoothing = 0.4
+        print(f"Motion smoothing: {value} ({self.detector.smoothing})")
+    
+    def on_preview_changed(self, value):
+        """Update how often the camera preview is painted"""
+        if value == "15 fps":
+            self.preview_interval = 1 / 15
+        elif value == "5 fps":
+            self.preview_interval = 1 / 5
+        elif value == "Off":
+            self.preview_interval = None
+        else:
+            self.preview_interval = 0.0
+        
+        if self.tracking and self.preview_interval is None:
+            self.camera_label.setText("Preview off")
+        self.update_preview_settings()
+        print(f"Camera preview: {value}")
+    
+    def update_preview_settings(self):
+        """Push preview size and rate to the worker"""
+        if not self.worker:
+            return
+        
+        size = self.camera_label.contentsRect().size()
+        self.worker.preview_size = (size.width(), size.height())
+        # Nobody can see the preview while minimized
+        self.worker.preview_interval = None if self.isMinimized() else self.preview_interval
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_preview_settings()
+    
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            self.update_preview_settings()
+        super().changeEvent(event)
+    
+    def on_idle_toggled(self, checked):
+        if self.worker:
+            self.worker.idle_enabled = checked
+        print(f"Power saving idle: {checked}")
+    
+    def on_idle_changed(self, idle):
+        """Reflect the worker's idle state in the status label"""
+        if not self.tracking:
+            return
+        
+        if idle:
+            self.status_label.setText("🟡 Idle (low power) - show hand to resume")
+            self.status_label.setStyleSheet("font-size: 13px; padding: 8px; background-color: #4a4220; border-radius: 5px; color: #ffd86b;")
+        else:
+            self.status_label.setText("🟢 Tracking active")
+            self.status_label.setStyleSheet("font-size: 13px; padding: 8px; background-color: #204a20; border-radius: 5px; color: #6bff6b;")
+    
     def start_tracking(self):
         try:
             # Initialize camera
-            self.cap = cv2.VideoCapture(0)
+            self.cap = open_camera(self.camera_settings)
             if not self.cap.isOpened():
                 self.status_label.setText("❌ Could not access camera")
                 return
+            self.camera_description = describe_camera(self.cap)
+            print(f"Camera opened: {self.camera_description}")
             
             self.tracking = True
             self.prev_y = None
+            self.detector.reset_tracking()
+            self.scroll_dispatcher.start()
             
             # Update UI
             self.status_label.setText("🟢 Tracking active")
@@ -204,10 +766,19 @@ class HandNavigationWindow(QWidget):
             self.btn_start.setEnabled(False)
             self.btn_stop.setEnabled(True)
             
-            # Start timer
-            self.timer = QTimer()
-            self.timer.timeout.connect(self.update_frame)
-            self.timer.start(30)
+            # Start capture/detection worker
+            self.worker = HandTrackingWorker(self.cap, self.detector)
+            self.worker.frame_ready.connect(self.on_frame_ready)
+            self.worker.idle_changed.connect(self.on_idle_changed)
+            self.worker.idle_enabled = self.idle_checkbox.isChecked()
+            self.update_preview_settings()
+            self.worker.start()
+            
+            if self.preview_interval is None:
+                self.camera_label.setText("Preview off")
+            
+            self.scroll_dispatcher.latencies.clear()
+            self.stats_timer.start(1000)
             
             print("Hand tracking started")
             
@@ -218,11 +789,15 @@ class HandNavigationWindow(QWidget):
     def stop_tracking(self):
         self.tracking = False
         
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.stats_timer.stop()
+        if self.worker:
+            self.worker.stop()
+            self.worker = None
+            self.scroll_dispatcher.stop()
         
         if self.cap:
             self.cap.release()
+            self.cap = None
         
         self.camera_label.setText("Camera Preview")
         
@@ -233,122 +808,27 @@ class HandNavigationWindow(QWidget):
         
         print("Hand tracking stopped")
     
-    def get_detection_mask(self, frame_shape):
-        """Create mask for detection zone"""
-        h, w = frame_shape[:2]
-        mask = np.zeros((h, w), dtype=np.uint8)
-        
-        if self.detection_zone == "bottom":
-            # Bottom half only
-            mask[h//2:, :] = 255
-            zone_rect = (0, h//2, w, h)
-        elif self.detection_zone == "left":
-            # Left third
-            mask[:, :w//3] = 255
-            zone_rect = (0, 0, w//3, h)
-        elif self.detection_zone == "right":
-            # Right third
-            mask[:, 2*w//3:] = 255
-            zone_rect = (2*w//3, 0, w, h)
-        else:
-            # Full frame
-            mask[:, :] = 255
-            zone_rect = (0, 0, w, h)
-        
-        return mask, zone_rect
-    
-    def update_frame(self):
-        if not self.tracking or not self.cap:
+    def on_frame_ready(self):
+        """Paint the newest processed frame and drive scrolling from it"""
+        if not self.tracking or not self.worker:
             return
         
-        ret, frame = self.cap.read()
-        if not ret:
+        result = self.worker.take_result()
+        if result is None:
             return
-        
-        # Flip frame
-        frame = cv2.flip(frame, 1)
-        
-        # Get detection zone
-        zone_mask, zone_rect = self.get_detection_mask(frame.shape)
-        
-        # Draw detection zone
-        cv2.rectangle(frame, (zone_rect[0], zone_rect[1]), 
-                     (zone_rect[2], zone_rect[3]), (0, 255, 0), 2)
-        cv2.putText(frame, "Detection Zone", (zone_rect[0] + 10, zone_rect[1] + 30),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        
-        # Detect hand in zone
-        hand_center = self.detect_hand_in_zone(frame, zone_mask)
+        preview, hand_center, frame_shape, captured_at = result
         
         if hand_center:
-            # Draw circle at hand center
-            cv2.circle(frame, hand_center, 15, (0, 255, 0), -1)
-            cv2.putText(frame, "Hand Detected", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            
             # Process scroll
-            hand_y = hand_center[1] / frame.shape[0]
-            self.process_scroll(hand_y)
+            hand_y = hand_center[1] / frame_shape[0]
+            self.process_scroll(hand_y, captured_at)
         else:
             self.prev_y = None
-            cv2.putText(frame, "Show hand in green zone", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-        
-        self.display_frame(frame)
-    
-    def detect_hand_in_zone(self, frame, zone_mask):
-        """Detect hand only in specified zone"""
-        # Convert to HSV
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        
-        # Skin color range (tuned to avoid brown backgrounds)
-        lower_skin = np.array([0, 30, 60], dtype=np.uint8)
-        upper_skin = np.array([20, 150, 255], dtype=np.uint8)
-        
-        # Create skin mask
-        skin_mask = cv2.inRange(hsv, lower_skin, upper_skin)
-        
-        # Apply zone mask
-        skin_mask = cv2.bitwise_and(skin_mask, skin_mask, mask=zone_mask)
-        
-        # Morphological operations to reduce noise
-        kernel = np.ones((5, 5), np.uint8)
-        skin_mask = cv2.erode(skin_mask, kernel, iterations=1)
-        skin_mask = cv2.dilate(skin_mask, kernel, iterations=2)
-        skin_mask = cv2.GaussianBlur(skin_mask, (5, 5), 0)
-        
-        # Find contours
-        contours, _ = cv2.findContours(skin_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        if contours:
-            # Filter contours by area and shape
-            valid_contours = []
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                # Hand should be reasonably large but not too large (face)
-                if 8000 < area < 50000:
-                    # Check if contour is somewhat vertical (hand-like)
-                    x, y, w, h = cv2.boundingRect(contour)
-                    aspect_ratio = h / w if w > 0 else 0
-                    
-                    # Hand is usually taller than wide
-                    if 0.8 < aspect_ratio < 3.0:
-                        valid_contours.append(contour)
-            
-            if valid_contours:
-                # Get largest valid contour
-                largest_contour = max(valid_contours, key=cv2.contourArea)
-                
-                # Get center
-                M = cv2.moments(largest_contour)
-                if M["m00"] != 0:
-                    cx = int(M["m10"] / M["m00"])
-                    cy = int(M["m01"] / M["m00"])
-                    return (cx, cy)
-        
-        return None
-    
-    def process_scroll(self, current_y):
+        
+        if preview is not None:
+            self.display_frame(preview)
+    
+    def process_scroll(self, current_y, captured_at=None):
         if self.prev_y is None:
             self.prev_y = current_y
             return
@@ -359,26 +839,18 @@ class HandNavigationWindow(QWidget):
             scroll_amount = int(-delta_y * self.scroll_sensitivity * 100)
             
             if scroll_amount != 0:
-                pyautogui.scroll(scroll_amount)
-                # print(f"Scrolling: {scroll_amount}")  # Commented to reduce spam
+                # Never blocks; injected by the dispatcher thread
+                self.scroll_dispatcher.push(scroll_amount, captured_at)
         
         self.prev_y = current_y
     
     def display_frame(self, frame):
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_frame.shape
-        bytes_per_line = ch * w
-        
-        qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        
-        scaled_pixmap = QPixmap.fromImage(qt_image).scaled(
-            self.camera_label.width(), 
-            self.camera_label.height(), 
-            Qt.KeepAspectRatio, 
-            Qt.SmoothTransformation
-        )
+        """Paint a BGR preview frame that the worker already sized to the label"""
+        h, w = frame.shape[:2]
         
-        self.camera_label.setPixmap(scaled_pixmap)
+        # Wrap the numpy buffer as-is; QPixmap.fromImage makes the only copy
+        qt_image = QImage(frame.data, w, h, frame.strides[0], QImage.Format_BGR888)
+        self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
     
     def closeEvent(self, event):
         self.stop_tracking()
@@ -0,0 +1,127 @@
+# journal.py
+import json
+import os
+import time
+
+# Append-only record of a session's steps, one JSON object per line:
+#   {"op": "add", "step": {...}}                 a captured step
+#   {"op": "update", "step": N, "fields": {...}} changes to step N (1-based)
+#   {"op": "export"} / {"op": "discard"}          session finished
+JOURNAL_NAME = "steps.jsonl"
+FINISHED_OPS = ("export", "discard")
+
+# Step fields that only describe the recorder's view (e.g. 'saving'),
+# never written to the journal, steps_data.json or archives
+VIEW_FIELDS = ("status",)
+
+def journal_path(session_dir):
+    return os.path.join(session_dir, JOURNAL_NAME)
+
+def step_record(step):
+    """Copy of a step without view-only fields, for writing to disk"""
+    return {key: value for key, value in step.items() if key not in VIEW_FIELDS}
+
+class StepJournal:
+    """Appends step records to a session's journal as they happen.
+
+    Every record is flushed to the OS right away, so only a machine
+    crash can lose it; fsync is batched to once every sync_every records
+    or sync_interval seconds, whichever comes first. Call sync() from a
+    timer so the last records are synced even when recording pauses.
+    """
+
+    def __init__(self, session_dir, sync_interval=1.0, sync_every=20):
+        self.path = journal_path(session_dir)
+        self.sync_interval = sync_interval
+        self.sync_every = sync_every
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def add(self, step):
+        self._write({"op": "add", "step": step_record(step)})
+
+    def update(self, step_number, **fields):
+        self._write({"op": "update", "step": step_number, "fields": fields})
+
+    def finish(self, op="export"):
+        """Mark the session exported (or discarded) and close the journal"""
+        self._write({"op": op})
+        self.close()
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if (self._unsynced >= self.sync_every or
+                time.monotonic() - self._last_sync >= self.sync_interval):
+            self.sync()
+
+    def sync(self):
+        """fsync anything written since the last sync"""
+        if self._unsynced and not self._file.closed:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+def load_journal(session_dir):
+    """Rebuild a session's steps from its journal.
+
+    A torn last line (crash mid-write) is ignored. Steps whose screenshot
+    never made it to disk are marked 'error', the rest 'saved'.
+    """
+    steps = []
+    with open(journal_path(session_dir), 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("op") == "add":
+                steps.append(record["step"])
+            elif record.get("op") == "update" and 0 < record["step"] <= len(steps):
+                steps[record["step"] - 1].update(record["fields"])
+            elif record.get("op") == "discard":
+                # Steps were cleared; recording may have gone on afterwards
+                steps = []
+
+    for step in steps:
+        step['status'] = 'saved' if os.path.exists(step['screenshot']) else 'error'
+    return steps
+
+def last_record(session_dir, tail_bytes=4096):
+    """The journal's last complete record, read without scanning the whole file"""
+    try:
+        with open(journal_path(session_dir), 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - tail_bytes))
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    for line in reversed(lines):
+        try:
+            return json.loads(line)
+        except ValueError:
+            continue
+    return None
+
+def find_unfinished_session(output_dir):
+    """Newest session folder whose journal was never exported or discarded"""
+    try:
+        names = sorted(os.listdir(output_dir), reverse=True)
+    except OSError:
+        return None
+    for name in names:
+        session_dir = os.path.join(output_dir, name)
+        if not name.startswith("session_") or not os.path.exists(journal_path(session_dir)):
+            continue
+        record = last_record(session_dir)
+        if record and record.get("op") not in FINISHED_OPS:
+            return session_dir
+    return None
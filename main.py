@@ -1,18 +1,19 @@
 # main.py
 import sys
+import time
 import threading
 from PySide6.QtWidgets import (QApplication, QWidget, QPushButton, 
                                QVBoxLayout, QLabel)
-from PySide6.QtCore import Qt, QPoint, QTimer, Signal, QObject
+from PySide6.QtCore import Qt, QPoint, Signal, QObject
 from PySide6.QtGui import QMouseEvent
 import keyboard
 from nightlight import NightLightWindow
-from recorder import StepsRecorderWindow
+from recorder import StepsRecorderWindow, exclude_from_capture
 from handnav import HandNavigationWindow
 
 class HotkeyListener(QObject):
     hotkey_pressed = Signal()
-    f9_pressed = Signal()
+    f9_pressed = Signal(float)  # perf_counter time of the key press
     
     def __init__(self):
         super().__init__()
@@ -25,14 +26,16 @@ class HotkeyListener(QObject):
         self.hotkey_pressed.emit()
     
     def on_f9(self):
-        self.f9_pressed.emit()
+        self.f9_pressed.emit(time.perf_counter())
 
 class FloatingMenu(QWidget):
     def __init__(self):
         super().__init__()
         self.recorder_window = None
+        self.restore_after_capture = False
         self.drag_position = QPoint()  # For dragging
         self.initUI()
+        self.capture_excluded = exclude_from_capture(self)
         self.setup_hotkey()
         
     def initUI(self):
@@ -126,24 +129,23 @@ class FloatingMenu(QWidget):
         thread.start()
         print("Hotkeys registered: Ctrl+Shift+Space (menu), F9 (capture)")
         
-    def on_f9_global(self):
+    def on_f9_global(self, pressed_at):
         """Handle global F9 press - hide menu during capture"""
         if self.recorder_window and self.recorder_window.recording:
-            # Hide main menu before capture
-            menu_was_visible = self.isVisible()
-            if menu_was_visible:
+            # Hide main menu before capture unless it is excluded from grabs
+            hide_menu = self.isVisible() and not self.capture_excluded
+            if hide_menu:
                 self.hide()
+                self.restore_after_capture = True
             
-            # Capture after brief delay
-            QTimer.singleShot(100, lambda: self._do_capture_and_restore(menu_was_visible))
+            # The recorder waits for the menu to leave the screen, then grabs
+            self.recorder_window.capture_step(pressed_at, hidden_windows=hide_menu)
     
-    def _do_capture_and_restore(self, restore_menu):
-        """Perform capture and restore menu visibility"""
-        self.recorder_window.capture_step()
-        
-        # Restore menu after capture completes (wait for screenshot to finish)
-        if restore_menu:
-            QTimer.singleShot(500, self.show)
+    def on_capture_finished(self):
+        """Restore the menu as soon as the screen has been grabbed"""
+        if self.restore_after_capture:
+            self.restore_after_capture = False
+            self.show()
         
     def toggle_visibility(self):
         print(f"Toggle called. Currently visible: {self.isVisible()}")
@@ -163,6 +165,7 @@ class FloatingMenu(QWidget):
         print("Opening Steps Recorder...")
         if not self.recorder_window:
             self.recorder_window = StepsRecorderWindow()
+            self.recorder_window.capture_finished.connect(self.on_capture_finished)
         self.recorder_window.show()
         
     def open_nightlight(self):
@@ -1,80 +1,448 @@
 # recorder.py
 import os
 import json
+import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                                QLabel, QListWidget, QComboBox, QTextEdit,
-                               QScrollArea, QFrame, QListWidgetItem)
-from PySide6.QtCore import Qt, QTimer, Signal
-from PySide6.QtGui import QPixmap, QImage
+                               QListView, QStyledItemDelegate, QListWidgetItem, QRubberBand,
+                               QApplication, QCheckBox, QLineEdit)
+from PySide6.QtCore import (Qt, QTimer, Signal, QRect, QPoint, QSize, QThread,
+                            QAbstractListModel, QModelIndex, QUrl)
+from PySide6.QtGui import (QPixmap, QImage, QPainter, QColor, QFont, QFontMetrics,
+                           QDesktopServices)
 import pyautogui
 import pygetwindow as gw
-from PIL import Image
 import mss
-import requests
+from screenshots import (SCREENSHOT_PROFILES, SCREENSHOT_SCALES, DEFAULT_PROFILE, THUMBNAIL_SIZE,
+                         DUPLICATE_THRESHOLDS, DEFAULT_DUPLICATE_THRESHOLD,
+                         AUTO_CAPTURE_THRESHOLDS, DEFAULT_AUTO_CAPTURE,
+                         save_screenshot, thumbnail_path, frame_signature, changed_fraction,
+                         screen_sample, sample_changed_fraction, saved_size)
+from summarizer import (CHUNK_SIZE, SUMMARY_FILE, abort_response, build_session_prompt,
+                        stream_summary, summarize_chunk, fill_report_summary)
+from report import write_report
+from archive import pack_session
+from journal import StepJournal, load_journal, find_unfinished_session, step_record
+from search_index import SearchIndex
 
-class StepItem(QFrame):
-    """Widget to display a single captured step"""
-    def __init__(self, step_data, step_number):
+# SetWindowDisplayAffinity flag, Windows 10 2004 and later
+WDA_EXCLUDEFROMCAPTURE = 0x11
+
+def exclude_from_capture(widget):
+    """Keep a window out of screen grabs so it needn't be hidden for a capture.
+    
+    Returns True if the platform supports it (Windows 10 2004+).
+    """
+    try:
+        import ctypes
+        hwnd = int(widget.winId())
+        return bool(ctypes.windll.user32.SetWindowDisplayAffinity(hwnd, WDA_EXCLUDEFROMCAPTURE))
+    except Exception:
+        return False
+
+def wait_for_compositor():
+    """Block until the desktop compositor has presented a new frame.
+    
+    After hiding a window this means it is gone from the screen. Returns
+    False where there is no DWM to wait on.
+    """
+    try:
+        import ctypes
+        return ctypes.windll.dwmapi.DwmFlush() == 0
+    except Exception:
+        return False
+
+def hide_delay_ms():
+    """Fallback wait for a hidden window to leave the screen.
+    
+    This is a fixed delay of two display refreshes, not a signal that the
+    window is gone; on a busy system it may still be on screen.
+    """
+    screen = QApplication.primaryScreen()
+    refresh_rate = screen.refreshRate() if screen else 60.0
+    return max(1, round(2000 / (refresh_rate or 60.0)))
+
+class ThumbnailCache:
+    """LRU of step thumbnails backed by the session's thumbs/ folder.
+    
+    Thumbnails made during capture are put() straight from memory; anything
+    else is loaded on first use from thumbs/, or (for sessions recorded
+    before thumbnails existed) scaled down from the full screenshot.
+    """
+    def __init__(self, max_items=200):
+        self.max_items = max_items
+        self._items = OrderedDict()  # screenshot path -> QPixmap
+    
+    def put(self, screenshot_path, image):
+        """Cache a thumbnail QImage for a screenshot"""
+        self._items[screenshot_path] = QPixmap.fromImage(image)
+        self._items.move_to_end(screenshot_path)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+    
+    def get(self, screenshot_path):
+        """Return the thumbnail QPixmap for a screenshot, loading it if needed"""
+        pixmap = self._items.get(screenshot_path)
+        if pixmap is not None:
+            self._items.move_to_end(screenshot_path)
+            return pixmap
+        
+        thumb_file = thumbnail_path(screenshot_path)
+        if os.path.exists(thumb_file):
+            image = QImage(thumb_file)
+        else:
+            image = QImage(screenshot_path)
+            if not image.isNull():
+                image = image.scaled(*THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        if image.isNull():
+            return None
+        self.put(screenshot_path, image)
+        return self._items[screenshot_path]
+    
+    def clear(self):
+        self._items.clear()
+
+
+class StepListModel(QAbstractListModel):
+    """List model over the recorder's captured steps"""
+    StepRole = Qt.UserRole + 1
+    
+    def __init__(self, steps):
         super().__init__()
-        self.step_data = step_data
-        self.initUI(step_number)
+        self.steps = steps
+        self._rows = {}  # id(step_data) -> row
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.steps)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == self.StepRole:
+            return self.steps[index.row()]
+        if role == Qt.DisplayRole:
+            return f"Step {index.row() + 1}"
+        return None
+    
+    def set_steps(self, steps):
+        """Replace all steps (e.g. after clearing)"""
+        self.beginResetModel()
+        self.steps = steps
+        self._rows = {id(step): row for row, step in enumerate(steps)}
+        self.endResetModel()
+    
+    def append_step(self, step_data):
+        row = len(self.steps)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.steps.append(step_data)
+        self._rows[id(step_data)] = row
+        self.endInsertRows()
+    
+    def step_changed(self, step_data):
+        """Repaint the row showing step_data, if it is still in the list"""
+        row = self._rows.get(id(step_data))
+        if row is not None and row < len(self.steps) and self.steps[row] is step_data:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+
+class StepDelegate(QStyledItemDelegate):
+    """Paints a step row: number, timestamp, window, actions and thumbnail.
+    
+    Only rows in view are painted, so thumbnails are fetched from the
+    ThumbnailCache on demand as rows scroll into view.
+    """
+    ROW_HEIGHT = THUMBNAIL_SIZE[1] + 30
+    
+    def __init__(self, thumbnails, parent=None):
+        super().__init__(parent)
+        self.thumbnails = thumbnails
+    
+    def sizeHint(self, option, index):
+        # Rows stretch to the view width
+        return QSize(0, self.ROW_HEIGHT)
+    
+    def paint(self, painter, option, index):
+        step_data = index.data(StepListModel.StepRole)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
         
-    def initUI(self, step_number):
-        self.setFrameStyle(QFrame.Box)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #3d3d3d;
-                border: 1px solid #555;
-                border-radius: 5px;
-                padding: 10px;
-                margin: 5px;
-            }
-        """)
+        # Card
+        card = option.rect.adjusted(5, 5, -5, -5)
+        painter.setPen(QColor("#555"))
+        painter.setBrush(QColor("#3d3d3d"))
+        painter.drawRoundedRect(card, 5, 5)
         
-        layout = QHBoxLayout()
+        # Thumbnail (or save state) on the right
+        thumb_w, thumb_h = THUMBNAIL_SIZE
+        thumb_rect = QRect(card.right() - thumb_w - 10, card.top() + (card.height() - thumb_h) // 2,
+                           thumb_w, thumb_h)
+        status = step_data.get('status', 'saved')
+        pixmap = self.thumbnails.get(step_data['screenshot']) if status == 'saved' else None
+        if pixmap:
+            target = QRect(QPoint(0, 0), pixmap.size())
+            target.moveCenter(thumb_rect.center())
+            painter.drawPixmap(target, pixmap)
+        else:
+            painter.setPen(QColor("#666"))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(thumb_rect)
+            painter.setPen(QColor("#aaa"))
+            painter.setFont(self._font(11))
+            painter.drawText(thumb_rect, Qt.AlignCenter,
+                             "❌ Save failed" if status == 'error' else "💾 Saving...")
         
-        # Step number and timestamp
-        info_layout = QVBoxLayout()
+        # Text on the left
+        text_rect = QRect(card.left() + 10, card.top() + 8,
+                          thumb_rect.left() - card.left() - 20, card.height() - 16)
+        title = f"Step {index.row() + 1}"
+        if step_data.get('repeats', 1) > 1:
+            title += f"  (×{step_data['repeats']})"
+        lines = [(title, self._font(14, bold=True), "white"),
+                 (step_data['timestamp'], self._font(11), "#aaa")]
+        if 'window' in step_data:
+            lines.append((f"Window: {step_data['window']}", self._font(11), "#ccc"))
+        if step_data.get('actions'):
+            lines.append((f"Actions: {', '.join(step_data['actions'])}", self._font(11), "#9cf"))
         
-        step_label = QLabel(f"Step {step_number}")
-        step_label.setStyleSheet("font-weight: bold; font-size: 14px;")
-        info_layout.addWidget(step_label)
+        y = text_rect.top()
+        for text, font, color in lines:
+            metrics = QFontMetrics(font)
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            elided = metrics.elidedText(text, Qt.ElideRight, text_rect.width())
+            painter.drawText(QRect(text_rect.left(), y, text_rect.width(), metrics.height()),
+                             Qt.AlignLeft | Qt.AlignVCenter, elided)
+            y += metrics.height() + 4
         
-        time_label = QLabel(self.step_data['timestamp'])
-        time_label.setStyleSheet("font-size: 11px; color: #aaa;")
-        info_layout.addWidget(time_label)
+        painter.restore()
+    
+    def _font(self, pixel_size, bold=False):
+        font = QFont()
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        return font
+
+
+class AutoCaptureWorker(QThread):
+    """Samples the capture area in the background and asks for a step on change.
+    
+    A step is requested when the active window title changes, or when the
+    share of changed sample points against the last step passes threshold.
+    Changes are debounced: the screen must hold still for settle_time
+    before the step is taken, so animations and typing produce one step
+    rather than many, and steps are at least min_interval apart.
+    """
+    change_detected = Signal(str)
+    
+    def __init__(self, get_capture_area):
+        super().__init__()
+        self.get_capture_area = get_capture_area
+        self.running = False
+        self._stop = threading.Event()
         
-        # Window info
-        if 'window' in self.step_data:
-            window_label = QLabel(f"Window: {self.step_data['window']}")
-            window_label.setStyleSheet("font-size: 11px; color: #ccc;")
-            info_layout.addWidget(window_label)
+        # Written from the GUI thread
+        self.threshold = 0.05
+        self.interval = 0.5       # seconds between samples
+        self.settle_time = 0.7    # screen must be stable this long before capturing
+        self.min_interval = 1.5   # minimum seconds between auto captures
+        self.cooldown = 0.8       # wait after a capture before taking the new baseline
+        self._rebaseline = threading.Event()
         
-        # Actions (keyboard/mouse)
-        if 'actions' in self.step_data and self.step_data['actions']:
-            actions_text = ", ".join(self.step_data['actions'])
-            action_label = QLabel(f"Actions: {actions_text}")
-            action_label.setStyleSheet("font-size: 11px; color: #9cf;")
-            action_label.setWordWrap(True)
-            info_layout.addWidget(action_label)
+        # Cost of the last sample (grab + downsample), in milliseconds
+        self.sample_ms = 0.0
+    
+    def rebaseline(self):
+        """Compare against the screen as it is after a (manual or auto) capture"""
+        self._rebaseline.set()
+    
+    def start(self, *args):
+        # Set before the thread runs, so a stop() that comes first isn't lost
+        self.running = True
+        self._stop.clear()
+        super().start(*args)
+    
+    def run(self):
+        baseline = None
+        baseline_title = None
+        previous = None
+        pending_since = None
+        pending_reason = ""
+        last_capture = 0.0
         
-        layout.addLayout(info_layout, stretch=3)
+        with mss.mss() as sct:
+            while self.running:
+                if self._rebaseline.is_set():
+                    self._rebaseline.clear()
+                    if self._stop.wait(self.cooldown):
+                        break
+                    baseline = None
+                    pending_since = None
+                
+                try:
+                    start = time.perf_counter()
+                    try:
+                        active_window = gw.getActiveWindow()
+                        title = active_window.title if active_window else "Unknown"
+                    except Exception:
+                        active_window = None
+                        title = "Unknown"
+                    shot = sct.grab(self.get_capture_area(sct, active_window))
+                    sample = screen_sample(shot.size, shot.raw)   # .bgra would copy the frame
+                    self.sample_ms = (time.perf_counter() - start) * 1000
+                except Exception as e:
+                    print(f"Auto capture sampling error: {e}")
+                    self._stop.wait(self.interval)
+                    continue
+                
+                if baseline is None:
+                    baseline, baseline_title, previous = sample, title, sample
+                    self._stop.wait(self.interval)
+                    continue
+                
+                now = time.monotonic()
+                if pending_since is None:
+                    if title != baseline_title:
+                        pending_since, pending_reason = now, "window changed"
+                    elif sample_changed_fraction(sample, baseline) > self.threshold:
+                        pending_since, pending_reason = now, "screen changed"
+                elif sample_changed_fraction(sample, previous) > self.threshold:
+                    # Still changing; restart the settle timer
+                    pending_since = now
+                elif now - pending_since >= self.settle_time and now - last_capture >= self.min_interval:
+                    last_capture = now
+                    pending_since = None
+                    self.change_detected.emit(pending_reason)
+                    self._rebaseline.set()
+                previous = sample
+                
+                self._stop.wait(self.interval)
+    
+    def stop(self):
+        self.running = False
+        self._stop.set()
+        self.wait()
+
+class SummaryWorker(QThread):
+    """Streams an LLM summary for an exported report off the GUI thread.
+    
+    Chunk summaries still being generated are waited for first, so the
+    final prompt only has to merge them. Text is emitted as it arrives;
+    when generation ends (or is cancelled) the report's summary
+    placeholder is replaced with the result.
+    """
+    text_received = Signal(str)
+    summary_done = Signal(str, str, str)   # (report path, status message, summary)
+    
+    def __init__(self, steps, report_path, session_dir=None, chunk_jobs=()):
+        super().__init__()
+        self.steps = steps
+        self.report_path = report_path
+        self.session_dir = session_dir
+        self.chunk_jobs = list(chunk_jobs)
+        self._cancel = threading.Event()
+        self._response = None
+    
+    def cancel(self):
+        self._cancel.set()
+        # Unblock a read waiting on the server
+        self._close_response()
+    
+    def _set_response(self, response):
+        self._response = response
+        if self._cancel.is_set():
+            self._close_response()
+    
+    def _close_response(self):
+        response = self._response
+        if response is not None:
+            try:
+                abort_response(response)
+            except Exception:
+                pass
+    
+    def run(self):
+        parts = []
+        status = "Summary complete"
+        try:
+            # Chunks that fail are summarized from their raw steps instead
+            while wait(self.chunk_jobs, timeout=0.2).not_done and not self._cancel.is_set():
+                pass
+            if not self._cancel.is_set():
+                prompt = build_session_prompt(self.session_dir, self.steps)
+                for text in stream_summary(prompt, self._cancel, on_response=self._set_response):
+                    parts.append(text)
+                    self.text_received.emit(text)
+            if self._cancel.is_set():
+                status = "Summary cancelled"
+        except Exception as e:
+            # Closing the response on cancel interrupts the read
+            if self._cancel.is_set():
+                status = "Summary cancelled"
+            else:
+                print(f"Error generating summary: {e}")
+                status = "Error generating summary"
+        self._response = None
         
-        # Thumbnail (if screenshot exists)
-        if 'screenshot' in self.step_data:
-            thumbnail = QLabel()
-            pixmap = QPixmap(self.step_data['screenshot'])
-            thumbnail.setPixmap(pixmap.scaled(150, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-            thumbnail.setStyleSheet("border: 1px solid #666;")
-            layout.addWidget(thumbnail, stretch=1)
+        summary = "".join(parts).strip()
+        if status != "Summary complete":
+            summary = f"{summary}\n\n({status})" if summary else status
+        try:
+            fill_report_summary(self.report_path, summary)
+            if parts:
+                summary_path = os.path.join(os.path.dirname(self.report_path), SUMMARY_FILE)
+                with open(summary_path, 'w', encoding='utf-8') as f:
+                    f.write(summary)
+        except Exception as e:
+            print(f"Error writing summary to report: {e}")
+        self.summary_done.emit(self.report_path, status, summary)
+
+class RegionSelector(QWidget):
+    """Full-screen overlay for dragging out a capture region"""
+    region_selected = Signal(QRect)
+    
+    def __init__(self):
+        super().__init__()
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setWindowOpacity(0.3)
+        self.setStyleSheet("background-color: black;")
+        self.setCursor(Qt.CrossCursor)
+        self.setGeometry(QApplication.primaryScreen().virtualGeometry())
         
-        self.setLayout(layout)
+        self.rubber_band = QRubberBand(QRubberBand.Rectangle, self)
+        self.origin = QPoint()
+    
+    def mousePressEvent(self, event):
+        self.origin = event.position().toPoint()
+        self.rubber_band.setGeometry(QRect(self.origin, QSize()))
+        self.rubber_band.show()
+    
+    def mouseMoveEvent(self, event):
+        self.rubber_band.setGeometry(QRect(self.origin, event.position().toPoint()).normalized())
+    
+    def mouseReleaseEvent(self, event):
+        rect = self.rubber_band.geometry()
+        self.close()
+        if rect.width() > 10 and rect.height() > 10:
+            self.region_selected.emit(QRect(self.mapToGlobal(rect.topLeft()), rect.size()))
+    
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.close()
 
 
 class StepsRecorderWindow(QWidget):
     # Signal for external capture trigger
     capture_requested = Signal()
+    # Emitted from the writer pool when a screenshot is on disk:
+    # (step_data, thumbnail PIL image or None, error)
+    screenshot_saved = Signal(object, object, str)
+    # Emitted once the screen has been grabbed (or the capture failed)
+    capture_finished = Signal()
     
     def __init__(self):
         super().__init__()
@@ -83,11 +451,82 @@ class StepsRecorderWindow(QWidget):
         self.output_dir = "recordings"
         self.current_session_dir = None
         
+        # Screenshot encoding, fixed for the duration of a session
+        self.screenshot_profile = DEFAULT_PROFILE
+        self.screenshot_scale = 1.0
+        
+        # What to capture: "monitor", "window", "region" or "all"
+        self.capture_mode = "monitor"
+        self.capture_monitor = 1          # mss monitor index, 1 = primary
+        self.capture_region = None        # mss dict for "region" mode
+        self.region_selector = None
+        # One mss grabber kept alive for the whole session
+        self.grabber = None
+        
+        # Near-duplicate captures: "keep", "skip" or "merge" into the last step
+        self.duplicate_mode = "merge"
+        self.last_capture = None          # (size, window, signature) of the last kept step
+        self.skipped_duplicates = 0
+        
+        # Change-triggered capture, runs while recording with auto capture on
+        self.auto_worker = None
+        
+        # Steps are journaled to the session dir as they are captured
+        self.journal = None
+        self.unfinished_session = None
+        self.journal_timer = QTimer()
+        self.journal_timer.timeout.connect(self.sync_journal)
+        self.journal_timer.start(1000)
+        
         # Create output directory
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
         
+        # Full-text search over all sessions; steps are added as they are captured
+        try:
+            self.search_index = SearchIndex(self.output_dir)
+        except Exception as e:
+            print(f"Search index unavailable: {e}")
+            self.search_index = None
+        
+        # Rolling chunk summaries, generated while recording
+        self.summary_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunk-summary")
+        self.chunk_jobs = []
+        self.chunk_cancel = threading.Event()
+        
+        # Summary generation for the last exported report; cancelled
+        # workers are kept referenced until their thread has finished
+        self.summary_worker = None
+        self.summary_workers = set()
+        
+        # Hotkey-to-step latency (perf_counter times)
+        self.capture_requested_at = None
+        self.save_started = {}   # id(step_data) -> time the capture was requested
+        self.grab_latencies = deque(maxlen=50)
+        self.save_latencies = deque(maxlen=50)
+        self._hidden_for_capture = False
+        # One capture runs at a time; requests made meanwhile coalesce into
+        # one more capture right after it (perf_counter time, or None)
+        self._capture_pending = False
+        self._capture_queued = None
+        
+        # Screenshots are encoded and written in the background
+        self.writer_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenshot-writer")
+        self.pending_saves = set()
+        self.thumbnails = ThumbnailCache()
+        self.screenshot_saved.connect(self.on_screenshot_saved)
+        
         self.initUI()
+        self.check_unfinished_session()
+        
+        # Catch up on sessions recorded or changed since the index was last updated
+        if self.search_index:
+            threading.Thread(target=self._sync_search_index, daemon=True).start()
+        
+        # Where supported the window stays visible and is left out of grabs
+        self.capture_excluded = exclude_from_capture(self)
+        
+        QApplication.instance().aboutToQuit.connect(self.shutdown)
         
     def initUI(self):
         self.setWindowTitle("Steps Recorder")
@@ -122,34 +561,141 @@ class StepsRecorderWindow(QWidget):
         controls_layout.addWidget(self.btn_stop)
         
         self.btn_capture = QPushButton("📸 Capture Now (F9)")
-        self.btn_capture.clicked.connect(self.capture_step)
+        self.btn_capture.clicked.connect(lambda: self.capture_step())
         self.btn_capture.setEnabled(False)
         self.btn_capture.setStyleSheet("padding: 12px; font-size: 14px; background-color: #4a4a4a;")
         controls_layout.addWidget(self.btn_capture)
         
         layout.addLayout(controls_layout)
         
+        # Offered when the last session was never exported (e.g. after a crash)
+        self.btn_resume = QPushButton()
+        self.btn_resume.clicked.connect(self.resume_session)
+        self.btn_resume.setStyleSheet("padding: 8px; font-size: 13px;")
+        self.btn_resume.hide()
+        layout.addWidget(self.btn_resume)
+        
+        # Screenshot encoding (chosen per session)
+        format_layout = QHBoxLayout()
+        format_label = QLabel("Screenshot Format:")
+        format_label.setStyleSheet("font-size: 13px;")
+        format_layout.addWidget(format_label)
+        
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(list(SCREENSHOT_PROFILES))
+        self.format_combo.setCurrentText(DEFAULT_PROFILE)
+        format_layout.addWidget(self.format_combo)
+        
+        self.scale_combo = QComboBox()
+        self.scale_combo.addItems(list(SCREENSHOT_SCALES))
+        format_layout.addWidget(self.scale_combo)
+        format_layout.addStretch()
+        layout.addLayout(format_layout)
+        
+        # Capture area
+        area_layout = QHBoxLayout()
+        area_label = QLabel("Capture Area:")
+        area_label.setStyleSheet("font-size: 13px;")
+        area_layout.addWidget(area_label)
+        
+        self.area_combo = QComboBox()
+        self.area_combo.addItems(["Active Window", "Selected Region...", "All Monitors"])
+        try:
+            with mss.mss() as sct:
+                monitor_count = len(sct.monitors) - 1
+        except Exception:
+            monitor_count = 1
+        for i in range(1, monitor_count + 1):
+            self.area_combo.addItem(f"Monitor {i}" + (" (primary)" if i == 1 else ""))
+        self.area_combo.setCurrentText("Monitor 1 (primary)")
+        self.area_combo.currentTextChanged.connect(self.on_capture_area_changed)
+        area_layout.addWidget(self.area_combo)
+        area_layout.addStretch()
+        layout.addLayout(area_layout)
+        
+        # Repeated captures of an unchanged screen
+        duplicate_layout = QHBoxLayout()
+        duplicate_label = QLabel("Duplicates:")
+        duplicate_label.setStyleSheet("font-size: 13px;")
+        duplicate_layout.addWidget(duplicate_label)
+        
+        self.duplicate_combo = QComboBox()
+        self.duplicate_combo.addItems(["Merge into previous step", "Skip", "Keep all"])
+        self.duplicate_combo.currentTextChanged.connect(self.on_duplicate_mode_changed)
+        duplicate_layout.addWidget(self.duplicate_combo)
+        
+        self.threshold_combo = QComboBox()
+        self.threshold_combo.addItems(list(DUPLICATE_THRESHOLDS))
+        self.threshold_combo.setCurrentText(DEFAULT_DUPLICATE_THRESHOLD)
+        duplicate_layout.addWidget(self.threshold_combo)
+        duplicate_layout.addStretch()
+        layout.addLayout(duplicate_layout)
+        
+        # Automatic capture on screen or window change
+        auto_layout = QHBoxLayout()
+        auto_label = QLabel("Auto Capture:")
+        auto_label.setStyleSheet("font-size: 13px;")
+        auto_layout.addWidget(auto_label)
+        
+        self.auto_combo = QComboBox()
+        self.auto_combo.addItems(list(AUTO_CAPTURE_THRESHOLDS))
+        self.auto_combo.setCurrentText(DEFAULT_AUTO_CAPTURE)
+        self.auto_combo.currentTextChanged.connect(self.on_auto_capture_changed)
+        auto_layout.addWidget(self.auto_combo)
+        auto_layout.addStretch()
+        layout.addLayout(auto_layout)
+        
+        # Search across all recorded sessions
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("🔍 Search all recordings (window titles, summaries)")
+        self.search_box.setStyleSheet("padding: 6px; font-size: 13px;")
+        self.search_box.textChanged.connect(lambda: self.search_timer.start())
+        layout.addWidget(self.search_box)
+        
+        self.search_timer = QTimer()
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        
+        self.search_status = QLabel()
+        self.search_status.setStyleSheet("font-size: 12px; color: #aaa;")
+        self.search_status.hide()
+        layout.addWidget(self.search_status)
+        
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(160)
+        self.search_results.setStyleSheet("font-size: 12px; border: 1px solid #555; background-color: #2b2b2b;")
+        self.search_results.itemDoubleClicked.connect(self.open_search_result)
+        self.search_results.hide()
+        layout.addWidget(self.search_results)
+        
         # Steps counter
         self.steps_counter = QLabel("Steps captured: 0")
         self.steps_counter.setStyleSheet("font-size: 13px; color: #aaa;")
         layout.addWidget(self.steps_counter)
         
+        # Capture latency
+        self.latency_label = QLabel("Capture latency: -")
+        self.latency_label.setStyleSheet("font-size: 12px; color: #aaa;")
+        layout.addWidget(self.latency_label)
+        
         # Steps list
         steps_label = QLabel("Captured Steps:")
         steps_label.setStyleSheet("font-size: 14px; margin-top: 10px;")
         layout.addWidget(steps_label)
         
-        # Scroll area for steps
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: 1px solid #555; background-color: #2b2b2b; }")
+        # Step list (only rows in view are painted)
+        self.step_model = StepListModel(self.steps)
+        self.steps_view = QListView()
+        self.steps_view.setModel(self.step_model)
+        self.steps_view.setItemDelegate(StepDelegate(self.thumbnails, self.steps_view))
+        self.steps_view.setUniformItemSizes(True)
+        self.steps_view.setSelectionMode(QListView.NoSelection)
+        self.steps_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.steps_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.steps_view.setStyleSheet("QListView { border: 1px solid #555; background-color: #2b2b2b; }")
         
-        self.steps_container = QWidget()
-        self.steps_layout = QVBoxLayout(self.steps_container)
-        self.steps_layout.setAlignment(Qt.AlignTop)
-        scroll.setWidget(self.steps_container)
-        
-        layout.addWidget(scroll, stretch=1)
+        layout.addWidget(self.steps_view, stretch=1)
         
         # Export section
         export_layout = QHBoxLayout()
@@ -167,6 +713,30 @@ class StepsRecorderWindow(QWidget):
         
         layout.addLayout(export_layout)
         
+        self.pack_checkbox = QCheckBox("📦 Also pack the session into a single .bubble file")
+        self.pack_checkbox.setStyleSheet("font-size: 12px;")
+        layout.addWidget(self.pack_checkbox)
+        
+        # Live LLM summary of the last export
+        summary_header = QHBoxLayout()
+        self.summary_status = QLabel("Summary: -")
+        self.summary_status.setStyleSheet("font-size: 12px; color: #aaa;")
+        summary_header.addWidget(self.summary_status)
+        summary_header.addStretch()
+        
+        self.btn_cancel_summary = QPushButton("Cancel")
+        self.btn_cancel_summary.clicked.connect(self.cancel_summary)
+        self.btn_cancel_summary.setEnabled(False)
+        self.btn_cancel_summary.setStyleSheet("padding: 4px 10px; font-size: 12px;")
+        summary_header.addWidget(self.btn_cancel_summary)
+        layout.addLayout(summary_header)
+        
+        self.summary_view = QTextEdit()
+        self.summary_view.setReadOnly(True)
+        self.summary_view.setMaximumHeight(120)
+        self.summary_view.setStyleSheet("font-size: 12px; border: 1px solid #555; background-color: #2b2b2b;")
+        layout.addWidget(self.summary_view)
+        
         # Close button
         btn_close = QPushButton("Close")
         btn_close.clicked.connect(self.close)
@@ -197,14 +767,125 @@ class StepsRecorderWindow(QWidget):
         
         self.setMinimumSize(700, 600)
     
+    def on_capture_area_changed(self, value):
+        """Switch capture mode; choosing a region opens the selector"""
+        if value == "Active Window":
+            self.capture_mode = "window"
+        elif value.startswith("Selected Region"):
+            self.capture_mode = "region"
+            self.region_selector = RegionSelector()
+            self.region_selector.region_selected.connect(self.on_region_selected)
+            self.region_selector.show()
+        elif value == "All Monitors":
+            self.capture_mode = "all"
+        else:
+            self.capture_mode = "monitor"
+            self.capture_monitor = int(value.split()[1])
+        print(f"Capture area: {value}")
+    
+    def on_auto_capture_changed(self, value):
+        """Start, retune or stop background change detection"""
+        threshold = AUTO_CAPTURE_THRESHOLDS[value]
+        if threshold is None or not self.recording:
+            self.stop_auto_capture()
+            return
+        if not self.auto_worker:
+            self.auto_worker = AutoCaptureWorker(self.get_capture_area)
+            self.auto_worker.change_detected.connect(self.on_auto_change)
+            self.auto_worker.start()
+        self.auto_worker.threshold = threshold
+    
+    def stop_auto_capture(self):
+        if self.auto_worker:
+            self.auto_worker.stop()
+            print(f"Auto capture stopped (last sample took {self.auto_worker.sample_ms:.1f} ms)")
+            self.auto_worker = None
+    
+    def on_auto_change(self, reason):
+        """Background sampler saw the screen change"""
+        if self.recording:
+            print(f"Auto capture: {reason}")
+            self.capture_step()
+    
+    def on_duplicate_mode_changed(self, value):
+        """Switch how captures of an unchanged screen are handled"""
+        self.duplicate_mode = {"Merge into previous step": "merge", "Skip": "skip"}.get(value, "keep")
+        self.threshold_combo.setEnabled(self.duplicate_mode != "keep")
+    
+    def is_duplicate(self, size, window_title, signature):
+        """Whether a capture matches the last kept step closely enough"""
+        if self.duplicate_mode == "keep" or not self.last_capture or not self.steps:
+            return False
+        last_size, last_window, last_signature = self.last_capture
+        if last_signature is None or size != last_size or window_title != last_window:
+            return False
+        threshold = DUPLICATE_THRESHOLDS[self.threshold_combo.currentText()]
+        return changed_fraction(signature, last_signature) <= threshold
+    
+    def update_steps_counter(self):
+        text = f"Steps captured: {len(self.steps)}"
+        if self.skipped_duplicates:
+            text += f" ({self.skipped_duplicates} duplicates not saved)"
+        self.steps_counter.setText(text)
+    
+    def on_region_selected(self, rect):
+        """Store a selected region in physical (mss) pixels"""
+        ratio = self.region_selector.screen().devicePixelRatio() if self.region_selector else 1.0
+        self.capture_region = {
+            'left': int(rect.x() * ratio),
+            'top': int(rect.y() * ratio),
+            'width': int(rect.width() * ratio),
+            'height': int(rect.height() * ratio),
+        }
+        print(f"Capture region: {self.capture_region}")
+    
+    def get_capture_area(self, sct, active_window):
+        """Return the mss area to grab for the current capture mode"""
+        primary = sct.monitors[1]
+        
+        if self.capture_mode == "all":
+            return sct.monitors[0]
+        if self.capture_mode == "region" and self.capture_region:
+            return self.capture_region
+        if self.capture_mode == "window" and active_window:
+            # Clip to the desktop; minimized windows report far-off coordinates
+            desktop = sct.monitors[0]
+            left = max(active_window.left, desktop['left'])
+            top = max(active_window.top, desktop['top'])
+            right = min(active_window.left + active_window.width, desktop['left'] + desktop['width'])
+            bottom = min(active_window.top + active_window.height, desktop['top'] + desktop['height'])
+            if right - left > 0 and bottom - top > 0:
+                return {'left': left, 'top': top, 'width': right - left, 'height': bottom - top}
+            return primary
+        if self.capture_mode == "monitor" and self.capture_monitor < len(sct.monitors):
+            return sct.monitors[self.capture_monitor]
+        return primary
+    
     def start_recording(self):
         """Start recording session"""
         self.recording = True
         
-        # Create session directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.current_session_dir = os.path.join(self.output_dir, f"session_{timestamp}")
-        os.makedirs(self.current_session_dir, exist_ok=True)
+        # Create session directory; steps not yet exported keep their session
+        if not (self.steps and self.current_session_dir):
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.current_session_dir = os.path.join(self.output_dir, f"session_{timestamp}")
+            os.makedirs(self.current_session_dir, exist_ok=True)
+            # A journal left open by an earlier session without steps belongs to its folder
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+        if not self.journal:
+            self.journal = StepJournal(self.current_session_dir)
+        self.btn_resume.hide()
+        
+        self.grabber = mss.mss()
+        self.last_capture = None
+        
+        # Lock in the screenshot format for this session
+        self.screenshot_profile = self.format_combo.currentText()
+        self.screenshot_scale = SCREENSHOT_SCALES[self.scale_combo.currentText()]
+        self.format_combo.setEnabled(False)
+        self.scale_combo.setEnabled(False)
         
         # Update UI
         self.status_label.setText("🔴 Recording... Press F9 to capture")
@@ -213,11 +894,27 @@ class StepsRecorderWindow(QWidget):
         self.btn_stop.setEnabled(True)
         self.btn_capture.setEnabled(True)
         
+        # Background change detection, if enabled
+        self.on_auto_capture_changed(self.auto_combo.currentText())
+        
         print("Recording started - Press F9 to capture steps")
     
     def stop_recording(self):
         """Stop recording session"""
         self.recording = False
+        self.stop_auto_capture()
+        
+        # Entries added during recording are up to date with the journal
+        if self.search_index and self.current_session_dir:
+            try:
+                self.search_index.mark_indexed(os.path.basename(self.current_session_dir),
+                                               self.current_session_dir)
+            except Exception as e:
+                print(f"Error updating search index: {e}")
+        
+        if self.grabber:
+            self.grabber.close()
+            self.grabber = None
         
         # Update UI
         self.status_label.setText("⚪ Recording stopped")
@@ -226,23 +923,60 @@ class StepsRecorderWindow(QWidget):
         self.btn_stop.setEnabled(False)
         self.btn_capture.setEnabled(False)
         self.btn_export.setEnabled(True)
+        self.format_combo.setEnabled(True)
+        self.scale_combo.setEnabled(True)
         
         print("Recording stopped")
     
-    def capture_step(self):
-        """Capture current screen state"""
+    def capture_step(self, requested_at=None, hidden_windows=False):
+        """Capture current screen state
+        
+        requested_at is the perf_counter time of the hotkey press, if any.
+        hidden_windows tells that the caller has just hidden windows of its
+        own, so the grab must wait for them to leave the screen too.
+        """
         if not self.recording:
             return
         
+        requested_at = requested_at or time.perf_counter()
+        if self._capture_pending:
+            # Still waiting for windows to leave the screen, or grabbing
+            self._capture_queued = requested_at
+            return
+        self._capture_pending = True
+        self.capture_requested_at = requested_at
         try:
-            # Hide this window before capturing (so it doesn't appear in screenshot)
-            self.hide()
-            QTimer.singleShot(200, self._do_capture)  # Wait 200ms for window to hide
+            # Hide this window before capturing unless it is excluded from grabs
+            if not self.capture_excluded and self.isVisible():
+                self.hide()
+                self._hidden_for_capture = True
+                hidden_windows = True
+            
+            if not hidden_windows or wait_for_compositor():
+                # Hidden windows are off the screen once a new frame is composed
+                self._do_capture()
+            else:
+                # No compositor to wait on: give it a fixed two refreshes
+                QTimer.singleShot(hide_delay_ms(), self._do_capture)
             
         except Exception as e:
             print(f"Error capturing step: {e}")
-            self.show()  # Make sure to show window again
+            self._finish_capture()
 
+    def _finish_capture(self):
+        """Bring back windows hidden for the capture, or take the queued one"""
+        self._capture_pending = False
+        requested_at, self._capture_queued = self._capture_queued, None
+        if requested_at is not None and self.recording:
+            # Windows are still hidden, so grab again straight away
+            self.capture_step(requested_at)
+            return
+        
+        if self._hidden_for_capture:
+            self._hidden_for_capture = False
+            self.show()
+        self.capture_finished.emit()
+    
     def _do_capture(self):
         """Actually perform the capture after window is hidden"""
         try:
@@ -251,55 +985,272 @@ class StepsRecorderWindow(QWidget):
                 active_window = gw.getActiveWindow()
                 window_title = active_window.title if active_window else "Unknown"
             except:
+                active_window = None
                 window_title = "Unknown"
             
+            if not self.grabber:
+                self.grabber = mss.mss()
+            
             # Take screenshot
-            with mss.mss() as sct:
-                screenshot = sct.grab(sct.monitors[1])  # Primary monitor
-                img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
-                
-                # Save screenshot
-                screenshot_path = os.path.join(self.current_session_dir, 
-                                              f"step_{len(self.steps)+1}.png")
-                img.save(screenshot_path)
+            area = self.get_capture_area(self.grabber, active_window)
+            screenshot = self.grabber.grab(area)
+            requested_at = self.capture_requested_at or time.perf_counter()
+            self.grab_latencies.append(time.perf_counter() - requested_at)
+            
+            # Auto capture compares against the screen after this step
+            if self.auto_worker:
+                self.auto_worker.rebaseline()
+            
+            # Skip or merge captures of a screen that hasn't changed
+            signature = None
+            if self.duplicate_mode != "keep":
+                signature = frame_signature(screenshot.size, screenshot.raw)
+                if self.is_duplicate(screenshot.size, window_title, signature):
+                    self.skipped_duplicates += 1
+                    if self.duplicate_mode == "merge":
+                        last_step = self.steps[-1]
+                        last_step['repeats'] = last_step.get('repeats', 1) + 1
+                        last_step['last_seen'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        self.step_model.step_changed(last_step)
+                        if self.journal:
+                            self.journal.update(len(self.steps), repeats=last_step['repeats'],
+                                                last_seen=last_step['last_seen'])
+                        print(f"Duplicate of step {len(self.steps)} merged: {window_title}")
+                    else:
+                        print(f"Duplicate of step {len(self.steps)} skipped: {window_title}")
+                    self.update_steps_counter()
+                    self.update_latency_label()
+                    self._finish_capture()
+                    return
+            self.last_capture = (screenshot.size, window_title, signature)
+            
+            ext = SCREENSHOT_PROFILES[self.screenshot_profile]["ext"]
+            screenshot_path = os.path.join(self.current_session_dir, 
+                                          f"step_{len(self.steps)+1}.{ext}")
             
             # Create step data
             step_data = {
                 'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 'window': window_title,
                 'screenshot': screenshot_path,
-                'actions': []
+                'size': saved_size(screenshot.size, self.screenshot_scale),
+                'actions': [],
+                'status': 'saving'
             }
             
-            self.steps.append(step_data)
+            # Add to list (the model appends to self.steps)
+            self.step_model.append_step(step_data)
+            self.steps_view.scrollToBottom()
+            if not self.journal:
+                self.journal = StepJournal(self.current_session_dir)
+            self.journal.add(step_data)
+            self.index_step(step_data)
             
-            # Add to UI
-            step_widget = StepItem(step_data, len(self.steps))
-            self.steps_layout.addWidget(step_widget)
+            self.queue_chunk_summary()
+            
+            # Encode and save in the background; the step shows up right away.
+            # The pool takes over the grab's raw buffer (.bgra would copy it)
+            future = self.writer_pool.submit(save_screenshot, screenshot.size,
+                                             screenshot.raw, screenshot_path,
+                                             self.screenshot_profile, self.screenshot_scale)
+            self.pending_saves.add(future)
+            self.save_started[id(step_data)] = requested_at
+            future.add_done_callback(lambda f, step=step_data: self._on_save_done(f, step))
             
             # Update counter
-            self.steps_counter.setText(f"Steps captured: {len(self.steps)}")
+            self.update_steps_counter()
             
             print(f"Step {len(self.steps)} captured: {window_title}")
             
-            # Show window again
-            self.show()
+            # Show windows again
+            self._finish_capture()
             
         except Exception as e:
             print(f"Error in _do_capture: {e}")
-            self.show()
+            self._finish_capture()
        
+    def _on_save_done(self, future, step_data):
+        """Writer pool callback; hands the result back to the GUI thread"""
+        self.pending_saves.discard(future)
+        error = future.exception()
+        if error:
+            self.screenshot_saved.emit(step_data, None, str(error))
+        else:
+            self.screenshot_saved.emit(step_data, future.result(), "")
+    
+    def on_screenshot_saved(self, step_data, thumb, error):
+        """Update a step once its screenshot has been written"""
+        requested_at = self.save_started.pop(id(step_data), None)
+        if requested_at and not error:
+            self.save_latencies.append(time.perf_counter() - requested_at)
+            self.update_latency_label()
+        
+        if error:
+            step_data['status'] = 'error'
+            print(f"Error saving {step_data['screenshot']}: {error}")
+        else:
+            step_data['status'] = 'saved'
+            # Cache the in-memory thumbnail so the list never reads it back
+            data = thumb.tobytes()
+            image = QImage(data, thumb.width, thumb.height, 3 * thumb.width, QImage.Format_RGB888).copy()
+            self.thumbnails.put(step_data['screenshot'], image)
+        
+        self.step_model.step_changed(step_data)
+    
+    def queue_chunk_summary(self):
+        """Summarize the last CHUNK_SIZE steps in the background once a chunk is complete"""
+        if len(self.steps) % CHUNK_SIZE:
+            return
+        first = len(self.steps) - CHUNK_SIZE
+        chunk = [dict(step) for step in self.steps[first:]]
+        future = self.summary_pool.submit(summarize_chunk, self.current_session_dir,
+                                          chunk, first + 1, self.chunk_cancel)
+        future.add_done_callback(self._on_chunk_summary_done)
+        self.chunk_jobs.append(future)
+    
+    def _on_chunk_summary_done(self, future):
+        if not future.cancelled() and future.exception():
+            print(f"Error summarizing steps: {future.exception()}")
+    
+    def _on_pack_done(self, future):
+        if future.exception():
+            print(f"Error packing session: {future.exception()}")
+        else:
+            print(f"Session packed: {future.result()}")
+    
+    def update_latency_label(self):
+        """Show hotkey-to-grab and hotkey-to-saved latency"""
+        if not self.grab_latencies:
+            return
+        text = f"Capture latency: grab {1000 * self.grab_latencies[-1]:.0f} ms"
+        if self.save_latencies:
+            saved = sorted(self.save_latencies)
+            text += (f", saved {1000 * self.save_latencies[-1]:.0f} ms"
+                     f" (median {1000 * saved[len(saved) // 2]:.0f} ms)")
+        self.latency_label.setText(text)
+    
+    def wait_for_pending_saves(self):
+        """Block until every queued screenshot has been written"""
+        if self.pending_saves:
+            print(f"Waiting for {len(self.pending_saves)} screenshot(s) to finish saving...")
+            wait(list(self.pending_saves))
+    
+    def _sync_search_index(self):
+        """Index new or changed sessions (background thread, own connection)"""
+        try:
+            index = SearchIndex(self.output_dir)
+            updated = index.sync()
+            index.close()
+            if updated:
+                print(f"Search index: {updated} session(s) indexed")
+        except Exception as e:
+            print(f"Error updating search index: {e}")
+    
+    def index_step(self, step_data):
+        if not self.search_index:
+            return
+        try:
+            self.search_index.add_step(os.path.basename(self.current_session_dir),
+                                       len(self.steps), step_data)
+        except Exception as e:
+            print(f"Error indexing step: {e}")
+    
+    def run_search(self):
+        """Search all sessions for the text in the search box"""
+        query = self.search_box.text().strip()
+        self.search_results.clear()
+        if not query or not self.search_index:
+            self.search_results.hide()
+            self.search_status.hide()
+            return
+        
+        start = time.perf_counter()
+        try:
+            results = self.search_index.search(query)
+        except Exception as e:
+            print(f"Search error: {e}")
+            results = []
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        for result in results:
+            if result['number']:
+                text = f"{result['session']}  ·  Step {result['number']}  ·  {result['timestamp']}  —  {result['text']}"
+                target = result['screenshot']
+            else:
+                text = f"{result['session']}  ·  Summary  —  {result['text']}"
+                target = os.path.join(self.output_dir, result['session'], "report.html")
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, target)
+            self.search_results.addItem(item)
+        
+        self.search_status.setText(f"{len(results)} result(s) in {elapsed:.1f} ms")
+        self.search_status.show()
+        self.search_results.setVisible(bool(results))
+    
+    def open_search_result(self, item):
+        path = item.data(Qt.UserRole)
+        if path and os.path.exists(path):
+            QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath(path)))
+    
+    def sync_journal(self):
+        """fsync journal records written since the last sync"""
+        if self.journal:
+            try:
+                self.journal.sync()
+            except Exception as e:
+                print(f"Error syncing step journal: {e}")
+    
+    def check_unfinished_session(self):
+        """Offer to resume the newest session that was never exported"""
+        self.unfinished_session = find_unfinished_session(self.output_dir)
+        if self.unfinished_session:
+            name = os.path.basename(self.unfinished_session)
+            self.btn_resume.setText(f"♻️ Resume unfinished {name}")
+            self.btn_resume.show()
+    
+    def resume_session(self):
+        """Rebuild the unfinished session's steps from its journal"""
+        if self.recording or self.steps or not self.unfinished_session:
+            return
+        try:
+            steps = load_journal(self.unfinished_session)
+        except Exception as e:
+            print(f"Error reading step journal: {e}")
+            return
+        
+        self.current_session_dir = self.unfinished_session
+        self.unfinished_session = None
+        self.steps = steps
+        self.step_model.set_steps(self.steps)
+        self.journal = StepJournal(self.current_session_dir)
+        self.btn_resume.hide()
+        self.update_steps_counter()
+        self.btn_export.setEnabled(bool(self.steps))
+        
+        print(f"Resumed {self.current_session_dir} with {len(self.steps)} steps")
+    
     def clear_steps(self):
         """Clear all captured steps"""
-        # Clear UI
-        while self.steps_layout.count():
-            child = self.steps_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        # The cleared session is not offered for resuming or found by search
+        if self.journal:
+            self.journal.finish("discard")
+            self.journal = None
+            if self.search_index:
+                self.search_index.remove_session(os.path.basename(self.current_session_dir))
         
-        # Clear data
+        # Clear data and UI
         self.steps = []
-        self.steps_counter.setText("Steps captured: 0")
+        self.step_model.set_steps(self.steps)
+        self.thumbnails.clear()
+        self.last_capture = None
+        self.skipped_duplicates = 0
+        self.save_started = {}
+        
+        # Drop chunk summaries still queued for the cleared steps
+        self.chunk_cancel.set()
+        self.chunk_cancel = threading.Event()
+        self.chunk_jobs = []
+        self.update_steps_counter()
         self.btn_export.setEnabled(False)
         
         print("All steps cleared")
@@ -310,117 +1261,111 @@ class StepsRecorderWindow(QWidget):
             print("No steps to export")
             return
         
-        print("Generating report with LLM summary...")
-        
-        # Generate summary using Ollama
-        summary = self.generate_llm_summary()
+        # Report and JSON must only reference finished screenshots
+        self.wait_for_pending_saves()
         
-        # Create HTML report
+        # Create HTML report; the summary is filled in once it has been generated
         html_path = os.path.join(self.current_session_dir, "report.html")
-        self.create_html_report(html_path, summary)
+        self.create_html_report(html_path)
         
         # Save JSON data
         json_path = os.path.join(self.current_session_dir, "steps_data.json")
         with open(json_path, 'w') as f:
-            json.dump(self.steps, f, indent=2)
+            json.dump([step_record(step) for step in self.steps], f)
+        if self.journal:
+            self.journal.finish("export")
+            self.journal = None
         
         print(f"Report exported to: {html_path}")
         
-        # Open the report
-        os.startfile(html_path)
+        # Stream the summary in the background; its chunk jobs must survive
+        # the clear below
+        self.start_summary(list(self.steps), html_path)
+        self.chunk_jobs = []
+        self.chunk_cancel = threading.Event()
+        
+        # Open the report (os.startfile is Windows-only)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath(html_path)))
         
         # Clear steps after export
         self.clear_steps()
         
-    def generate_llm_summary(self):
-        """Generate summary using Ollama"""
-        try:
-            # Prepare prompt
-            steps_text = "\n".join([
-                f"Step {i+1} ({step['timestamp']}): {step['window']}"
-                for i, step in enumerate(self.steps)
-            ])
-            
-            prompt = f"""Analyze these recorded steps and provide:
-1. A brief summary of what was accomplished
-2. A checklist of the main actions taken
-
-Recorded Steps:
-{steps_text}
-
-Please format your response as:
-SUMMARY: [brief summary]
-CHECKLIST:
-- [action 1]
-- [action 2]
-etc."""
-            
-            # Call Ollama API
-            response = requests.post('http://localhost:11434/api/generate',
-                json={
-                    'model': 'llama3.2',
-                    'prompt': prompt,
-                    'stream': False
-                },
-                timeout=30)
-            
-            if response.status_code == 200:
-                return response.json()['response']
-            else:
-                return "Could not generate summary"
-                
-        except Exception as e:
-            print(f"Error generating summary: {e}")
-            return "Error generating summary"
-    
-    def create_html_report(self, path, summary):
-        """Create HTML report file"""
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Steps Recording Report</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-        .header {{ background-color: #2b2b2b; color: white; padding: 20px; border-radius: 5px; }}
-        .summary {{ background-color: white; padding: 20px; margin: 20px 0; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        .step {{ background-color: white; padding: 15px; margin: 10px 0; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        .step-number {{ font-weight: bold; color: #2b2b2b; font-size: 18px; }}
-        .timestamp {{ color: #666; font-size: 12px; }}
-        .screenshot {{ max-width: 100%; border: 1px solid #ddd; margin-top: 10px; }}
-        pre {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; white-space: pre-wrap; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>📝 Steps Recording Report</h1>
-        <p>Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-        <p>Total Steps: {len(self.steps)}</p>
-    </div>
-    
-    <div class="summary">
-        <h2>🤖 AI-Generated Summary</h2>
-        <pre>{summary}</pre>
-    </div>
-    
-    <h2>Detailed Steps</h2>
-"""
-        
-        # Add each step
-        for i, step in enumerate(self.steps):
-            html += f"""
-    <div class="step">
-        <div class="step-number">Step {i+1}</div>
-        <div class="timestamp">{step['timestamp']}</div>
-        <p><strong>Window:</strong> {step['window']}</p>
-        <img src="{os.path.basename(step['screenshot'])}" class="screenshot" />
-    </div>
-"""
-        
-        html += """
-</body>
-</html>
-"""
-        
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(html)
\ No newline at end of file
+    def start_summary(self, steps, report_path):
+        """Generate the LLM summary for a report without blocking the UI"""
+        self.cancel_summary()
+        
+        print("Generating LLM summary...")
+        self.summary_view.clear()
+        self.summary_status.setText("Summary: generating...")
+        self.btn_cancel_summary.setEnabled(True)
+        
+        self.summary_worker = SummaryWorker(steps, report_path, self.current_session_dir,
+                                            self.chunk_jobs)
+        self.summary_worker.text_received.connect(self.on_summary_text)
+        self.summary_worker.summary_done.connect(self.on_summary_done)
+        worker = self.summary_worker
+        self.summary_workers.add(worker)
+        worker.finished.connect(lambda: self.summary_workers.discard(worker))
+        worker.start()
+    
+    def cancel_summary(self):
+        """Stop the running summary; the report keeps what was generated so far"""
+        if self.summary_worker:
+            self.summary_worker.cancel()
+            self.summary_worker = None
+            self.summary_status.setText("Summary: cancelled")
+        self.btn_cancel_summary.setEnabled(False)
+    
+    def on_summary_text(self, text):
+        if self.sender() is not self.summary_worker:
+            return
+        cursor = self.summary_view.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        cursor.insertText(text)
+        self.summary_view.setTextCursor(cursor)
+    
+    def on_summary_done(self, report_path, status, summary):
+        print(f"{status}: {report_path}")
+        if self.search_index:
+            session_dir = os.path.dirname(report_path)
+            summary_path = os.path.join(session_dir, SUMMARY_FILE)
+            try:
+                # Index what the worker saved, as index_session would; errors
+                # and runs cancelled before any text leave no summary file
+                if os.path.exists(summary_path):
+                    with open(summary_path, 'r', encoding='utf-8') as f:
+                        self.search_index.set_summary(os.path.basename(session_dir), f.read())
+                self.search_index.mark_indexed(os.path.basename(session_dir), session_dir)
+            except Exception as e:
+                print(f"Error indexing summary: {e}")
+        # The report is final now, so the session can be packed
+        if self.pack_checkbox.isChecked():
+            future = self.summary_pool.submit(pack_session, os.path.dirname(report_path))
+            future.add_done_callback(self._on_pack_done)
+        if self.sender() is self.summary_worker:
+            self.summary_worker = None
+            self.summary_status.setText(f"Summary: {status.lower()}")
+            self.btn_cancel_summary.setEnabled(False)
+    
+    def shutdown(self):
+        """Stop background work before the app exits"""
+        self.journal_timer.stop()
+        self.stop_auto_capture()
+        self.cancel_summary()
+        self.chunk_cancel.set()
+        for worker in list(self.summary_workers):
+            worker.cancel()
+            worker.wait()
+        self.summary_pool.shutdown(wait=True, cancel_futures=True)
+        # Queued screenshots are still written; their steps are in the journal
+        self.writer_pool.shutdown(wait=True)
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        if self.search_index:
+            self.search_index.close()
+            self.search_index = None
+    
+    def create_html_report(self, path, summary=None):
+        """Create HTML report file (plus extra pages for long sessions)"""
+        write_report(path, self.steps, summary)
\ No newline at end of file
@@ -0,0 +1,141 @@
+# report.py
+import os
+from datetime import datetime
+from html import escape
+from screenshots import thumbnail_path
+from summarizer import SUMMARY_PLACEHOLDER, RELOAD_PLACEHOLDER
+
+# Reports longer than this are split into pages linked from the first one
+STEPS_PER_PAGE = 50
+
+REPORT_STYLE = """
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
+        .header { background-color: #2b2b2b; color: white; padding: 20px; border-radius: 5px; }
+        .summary { background-color: white; padding: 20px; margin: 20px 0; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .step { background-color: white; padding: 15px; margin: 10px 0; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .step-number { font-weight: bold; color: #2b2b2b; font-size: 18px; }
+        .timestamp { color: #666; font-size: 12px; }
+        .screenshot { max-width: 100%; height: auto; border: 1px solid #ddd; margin-top: 10px; background-size: 100% 100%; background-repeat: no-repeat; }
+        .pages { background-color: white; padding: 10px 20px; margin: 20px 0; border-radius: 5px; }
+        .pages a, .pages strong { margin-right: 12px; }
+        pre { background-color: #f5f5f5; padding: 15px; border-radius: 5px; white-space: pre-wrap; }
+"""
+
+def page_path(path, page):
+    """File for a report page; page 1 is the report itself"""
+    if page == 1:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_page{page}{ext}"
+
+def write_report(path, steps, summary=None, steps_per_page=STEPS_PER_PAGE):
+    """Write an HTML report for steps, streaming it to disk step by step.
+
+    Long reports are split into pages of steps_per_page steps; every page
+    links to the others. Without a summary the first page gets a
+    placeholder (and reloads itself) until fill_report_summary replaces
+    it. Returns the paths of all pages.
+    """
+    page_count = max(1, (len(steps) + steps_per_page - 1) // steps_per_page)
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    paths = []
+
+    for page in range(1, page_count + 1):
+        first = (page - 1) * steps_per_page
+        page_steps = steps[first:first + steps_per_page]
+        paths.append(page_path(path, page))
+
+        with open(paths[-1], 'w', encoding='utf-8') as f:
+            reload_tag = RELOAD_PLACEHOLDER if summary is None and page == 1 else ""
+            f.write(f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Steps Recording Report</title>
+    {reload_tag}
+    <style>{REPORT_STYLE}    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>📝 Steps Recording Report</h1>
+        <p>Generated: {generated}</p>
+        <p>Total Steps: {len(steps)}</p>
+    </div>
+""")
+
+            if page == 1:
+                text = SUMMARY_PLACEHOLDER if summary is None else escape(summary)
+                f.write(f"""
+    <div class="summary">
+        <h2>🤖 AI-Generated Summary</h2>
+        <pre>{text}</pre>
+    </div>
+""")
+
+            if page_count > 1:
+                _write_page_links(f, path, page, page_count, steps_per_page, len(steps))
+
+            f.write("""
+    <h2>Detailed Steps</h2>
+""")
+            for number, step in enumerate(page_steps, first + 1):
+                _write_step(f, number, step)
+
+            if page_count > 1:
+                _write_page_links(f, path, page, page_count, steps_per_page, len(steps))
+
+            f.write("""
+</body>
+</html>
+""")
+
+    # Pages left over from an earlier, longer export of the same report
+    stale = page_count + 1
+    while os.path.exists(page_path(path, stale)):
+        os.remove(page_path(path, stale))
+        stale += 1
+
+    return paths
+
+def _write_page_links(f, path, page, page_count, steps_per_page, total):
+    """Index of all pages, with the current one highlighted"""
+    links = []
+    for other in range(1, page_count + 1):
+        first = (other - 1) * steps_per_page + 1
+        label = f"Steps {first}-{min(total, first + steps_per_page - 1)}"
+        if other == page:
+            links.append(f"<strong>{label}</strong>")
+        else:
+            href = os.path.basename(page_path(path, other))
+            links.append(f'<a href="{escape(href)}">{label}</a>')
+    f.write(f"""
+    <div class="pages">{" ".join(links)}</div>
+""")
+
+def _write_step(f, number, step):
+    repeats = ""
+    if step.get('repeats', 1) > 1:
+        repeats = f" (captured {step['repeats']} times, last at {step['last_seen']})"
+
+    # The full screenshot loads lazily as it nears the viewport; until then
+    # its small thumbnail is stretched behind it as a placeholder, and the
+    # width/height attributes reserve its space so the page doesn't jump
+    full = escape(os.path.basename(step['screenshot']))
+    thumb = escape(os.path.relpath(thumbnail_path(step['screenshot']),
+                                   os.path.dirname(step['screenshot'])).replace(os.sep, '/'))
+    if step.get('size'):
+        width, height = step['size']
+        image = (f'<img src="{full}" width="{width}" height="{height}" loading="lazy" '
+                 f'class="screenshot" style="background-image: url(\'{thumb}\')" />')
+    else:
+        image = f'<img src="{full}" loading="lazy" class="screenshot" />'
+
+    f.write(f"""
+    <div class="step">
+        <div class="step-number">Step {number}</div>
+        <div class="timestamp">{step['timestamp']}{repeats}</div>
+        <p><strong>Window:</strong> {escape(step['window'])}</p>
+        <a href="{full}">{image}</a>
+    </div>
+""")
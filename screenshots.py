@@ -0,0 +1,143 @@
+# screenshots.py
+import os
+import numpy as np
+from PIL import Image
+
+# Encoding profiles offered per recording session. "options" are passed
+# straight to PIL's Image.save for that format.
+SCREENSHOT_PROFILES = {
+    "PNG (fast)": {"format": "PNG", "ext": "png", "options": {"compress_level": 1}},
+    "PNG (balanced)": {"format": "PNG", "ext": "png", "options": {"compress_level": 6}},
+    "PNG (smallest)": {"format": "PNG", "ext": "png", "options": {"compress_level": 9}},
+    "WebP lossless": {"format": "WEBP", "ext": "webp", "options": {"lossless": True, "quality": 25, "method": 2}},
+    "WebP (quality 80)": {"format": "WEBP", "ext": "webp", "options": {"quality": 80, "method": 2}},
+    "JPEG (quality 85)": {"format": "JPEG", "ext": "jpg", "options": {"quality": 85}},
+}
+
+DEFAULT_PROFILE = "PNG (fast)"
+
+# Optional downscale applied before encoding
+SCREENSHOT_SCALES = {
+    "Full size": 1.0,
+    "75%": 0.75,
+    "50%": 0.5,
+}
+
+# Step list thumbnails, stored next to the screenshots in thumbs/
+THUMBNAIL_SIZE = (150, 100)
+THUMBNAIL_DIR = "thumbs"
+
+# Near-duplicate detection: captures are compared as small grayscale
+# block averages, each cell the mean of SIGNATURE_POINTS x SIGNATURE_POINTS
+# evenly spread pixels. A cell counts as changed when it differs by more
+# than SIGNATURE_NOISE levels; thresholds are the fraction of changed cells.
+SIGNATURE_SIZE = (128, 72)
+SIGNATURE_POINTS = 4
+SIGNATURE_NOISE = 4
+DUPLICATE_THRESHOLDS = {
+    "Identical": 0.0,
+    "Nearly identical (<0.1%)": 0.001,
+    "Similar (<1%)": 0.01,
+}
+DEFAULT_DUPLICATE_THRESHOLD = "Nearly identical (<0.1%)"
+
+# Auto capture: background samples keep every SAMPLE_STRIDE-th pixel in
+# each direction; a sample point counts as changed when any colour channel
+# differs by more than SAMPLE_NOISE levels
+SAMPLE_STRIDE = 8
+SAMPLE_NOISE = 16
+AUTO_CAPTURE_THRESHOLDS = {
+    "Off": None,
+    "Sensitive (1%)": 0.01,
+    "Normal (5%)": 0.05,
+    "Major changes only (20%)": 0.2,
+}
+DEFAULT_AUTO_CAPTURE = "Off"
+
+def thumbnail_path(screenshot_path):
+    """Return where the thumbnail for a screenshot is stored"""
+    folder, name = os.path.split(screenshot_path)
+    return os.path.join(folder, THUMBNAIL_DIR, os.path.splitext(name)[0] + ".png")
+
+def make_thumbnail(img):
+    """Return a THUMBNAIL_SIZE-bounded copy of img"""
+    thumb = img.copy()
+    thumb.thumbnail(THUMBNAIL_SIZE, Image.Resampling.BILINEAR)
+    return thumb
+
+def image_from_bgra(size, bgra):
+    """Wrap a raw BGRA screen grab as an RGB PIL image"""
+    return Image.frombuffer('RGB', size, bgra, 'raw', 'BGRX', 0, 1)
+
+def saved_size(size, scale=1.0):
+    """(width, height) a grab of size ends up with after prepare_image"""
+    width, height = size
+    if scale == 1.0:
+        return (width, height)
+    if scale == 0.5:
+        return ((width + 1) // 2, (height + 1) // 2)
+    return (max(1, round(width * scale)), max(1, round(height * scale)))
+
+def prepare_image(img, scale=1.0):
+    """Downscale img for saving (no-op at full size)"""
+    if scale == 1.0:
+        return img
+    if scale == 0.5:
+        # Box-filter halving is much cheaper than a general resize
+        return img.reduce(2)
+    return img.resize(saved_size(img.size, scale), Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+def frame_signature(size, bgra):
+    """Return a small grayscale summary of a raw BGRA grab for duplicate checks.
+
+    Only a grid of sample points is read, straight from the grab's buffer,
+    so this stays cheap on the GUI thread even for 4K captures.
+    """
+    width, height = size
+    cols, rows = SIGNATURE_SIZE
+    pixels = np.frombuffer(bgra, dtype=np.uint8).reshape(height, width, 4)
+    ys = ((np.arange(rows * SIGNATURE_POINTS) + 0.5) * height / (rows * SIGNATURE_POINTS)).astype(np.intp)
+    xs = ((np.arange(cols * SIGNATURE_POINTS) + 0.5) * width / (cols * SIGNATURE_POINTS)).astype(np.intp)
+    sample = pixels[ys[:, None], xs[None, :], :3].astype(np.float32)
+    gray = sample @ np.array([0.114, 0.587, 0.299], dtype=np.float32)   # BGR weights
+    cells = gray.reshape(rows, SIGNATURE_POINTS, cols, SIGNATURE_POINTS).mean(axis=(1, 3))
+    return cells.round().astype(np.uint8)
+
+def changed_fraction(signature, previous):
+    """Fraction of signature cells that differ noticeably from previous"""
+    diff = np.abs(signature.astype(np.int16) - previous)
+    return np.count_nonzero(diff > SIGNATURE_NOISE) / diff.size
+
+def screen_sample(size, bgra, stride=SAMPLE_STRIDE):
+    """Return a strided low-resolution sample of a raw BGRA grab (a copy)"""
+    width, height = size
+    pixels = np.frombuffer(bgra, dtype=np.uint8).reshape(height, width, 4)
+    return pixels[::stride, ::stride, :3].copy()
+
+def sample_changed_fraction(sample, previous):
+    """Fraction of sample points that differ noticeably from previous"""
+    if previous is None or sample.shape != previous.shape:
+        return 1.0
+    diff = np.abs(sample.astype(np.int16) - previous).max(axis=2)
+    return np.count_nonzero(diff > SAMPLE_NOISE) / diff.size
+
+def encode_image(img, fp, profile_name):
+    """Write img to a path or file object using a screenshot profile"""
+    profile = SCREENSHOT_PROFILES[profile_name]
+    img.save(fp, format=profile["format"], **profile["options"])
+
+def save_screenshot(size, bgra, path, profile_name=DEFAULT_PROFILE, scale=1.0):
+    """Encode a raw BGRA grab and write it to path (runs on the writer pool).
+
+    Also writes its thumbnail to thumbs/ and returns the thumbnail as an
+    RGB PIL image so the caller can cache it without reading it back.
+    """
+    img = prepare_image(image_from_bgra(size, bgra), scale)
+
+    thumb = make_thumbnail(img)
+    thumb_path = thumbnail_path(path)
+    os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+    thumb.save(thumb_path, format="PNG", compress_level=1)
+
+    encode_image(img, path, profile_name)
+    return thumb
@@ -0,0 +1,148 @@
+# search_index.py
+import json
+import os
+import re
+import sqlite3
+from journal import journal_path, load_journal
+from summarizer import SUMMARY_FILE
+
+# One SQLite database in the recordings folder indexes every session's
+# steps (window title, timestamp) and LLM summary for full-text search
+INDEX_NAME = "search_index.sqlite"
+
+class SearchIndex:
+    """Full-text index over recorded sessions (SQLite FTS5, LIKE fallback).
+
+    Each entry is a step (number >= 1, text = window title) or a session
+    summary (number 0). The connection belongs to the thread that created
+    the index; use a separate SearchIndex per thread.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.conn = sqlite3.connect(os.path.join(output_dir, INDEX_NAME), timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS sessions (name TEXT PRIMARY KEY, signature TEXT)")
+        try:
+            self.conn.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5(
+                text, timestamp, session UNINDEXED, number UNINDEXED, screenshot UNINDEXED)""")
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+                text TEXT, timestamp TEXT, session TEXT, number INTEGER, screenshot TEXT)""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS entries_session ON entries (session)")
+            self.fts = False
+        self.conn.commit()
+
+    def add_step(self, session, number, step):
+        """Index a newly captured step"""
+        self.conn.execute("INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+                          (step['window'], step['timestamp'], session, number, step['screenshot']))
+        self.conn.commit()
+
+    def set_summary(self, session, summary):
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE session = ? AND number = 0", (session,))
+            self.conn.execute("INSERT INTO entries VALUES (?, '', ?, 0, '')", (summary, session))
+
+    def remove_session(self, session):
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE session = ?", (session,))
+            self.conn.execute("DELETE FROM sessions WHERE name = ?", (session,))
+
+    def search(self, query, limit=50):
+        """Return matching steps and summaries, best matches first"""
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+
+        if self.fts:
+            # Every term must match, as a prefix so results show up while typing
+            match = " ".join(f'"{term}"*' for term in terms)
+            rows = self.conn.execute("""
+                SELECT session, number, timestamp, screenshot,
+                       snippet(entries, 0, '', '', '…', 12)
+                FROM entries WHERE entries MATCH ? ORDER BY rank LIMIT ?""",
+                (match, limit)).fetchall()
+        else:
+            where = " AND ".join("text LIKE ?" for _ in terms)
+            rows = self.conn.execute(f"""
+                SELECT session, number, timestamp, screenshot, text
+                FROM entries WHERE {where} ORDER BY session DESC, number LIMIT ?""",
+                [f"%{term}%" for term in terms] + [limit]).fetchall()
+
+        return [{"session": session, "number": int(number), "timestamp": timestamp,
+                 "screenshot": screenshot, "text": text}
+                for session, number, timestamp, screenshot, text in rows]
+
+    def sync(self):
+        """Index sessions that are new or changed since they were last indexed.
+
+        Returns the number of sessions (re)indexed.
+        """
+        indexed = dict(self.conn.execute("SELECT name, signature FROM sessions"))
+        updated = 0
+        for name in sorted(os.listdir(self.output_dir)):
+            session_dir = os.path.join(self.output_dir, name)
+            if not name.startswith("session_") or not os.path.isdir(session_dir):
+                continue
+            signature = session_signature(session_dir)
+            if indexed.get(name) == signature:
+                continue
+            try:
+                self.index_session(name, session_dir, signature)
+                updated += 1
+            except Exception as e:
+                print(f"Error indexing {name}: {e}")
+        return updated
+
+    def index_session(self, name, session_dir, signature=None):
+        """Replace a session's entries with what is on disk"""
+        steps = read_session_steps(session_dir)
+        summary = None
+        summary_path = os.path.join(session_dir, SUMMARY_FILE)
+        if os.path.exists(summary_path):
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                summary = f.read()
+
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE session = ?", (name,))
+            self.conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+                                  [(step['window'], step['timestamp'], name, number, step['screenshot'])
+                                   for number, step in enumerate(steps, 1)])
+            if summary:
+                self.conn.execute("INSERT INTO entries VALUES (?, '', ?, 0, '')", (summary, name))
+            self.conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?)",
+                              (name, signature or session_signature(session_dir)))
+
+    def mark_indexed(self, session, session_dir):
+        """Record that a session's entries match its files (after incremental updates)"""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?)",
+                              (session, session_signature(session_dir)))
+
+    def close(self):
+        self.conn.close()
+
+def read_session_steps(session_dir):
+    """A session's steps, from its journal or else its steps_data.json"""
+    if os.path.exists(journal_path(session_dir)):
+        return load_journal(session_dir)
+    steps_file = os.path.join(session_dir, "steps_data.json")
+    if os.path.exists(steps_file):
+        with open(steps_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return []
+
+def session_signature(session_dir):
+    """Changes whenever a session's steps or summary change on disk"""
+    parts = []
+    for name in (os.path.basename(journal_path(session_dir)), "steps_data.json", SUMMARY_FILE):
+        try:
+            stat = os.stat(os.path.join(session_dir, name))
+            parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            pass
+    return "|".join(parts)
@@ -0,0 +1,213 @@
+# summarizer.py
+import hashlib
+import html
+import os
+import json
+import socket
+import threading
+import requests
+
+# Local Ollama server used for report summaries
+OLLAMA_URL = "http://localhost:11434/api/generate"
+OLLAMA_MODEL = "llama3.2"
+
+# Marks the summary in an exported report until generation finishes. The
+# reload tag in <head> refreshes the open report until it is replaced.
+SUMMARY_PLACEHOLDER = "<!--summary-->⏳ Generating summary...<!--/summary-->"
+RELOAD_PLACEHOLDER = '<!--reload--><meta http-equiv="refresh" content="3"><!--/reload-->'
+
+# Rolling summaries: every CHUNK_SIZE steps are summarized while recording
+# and cached in <session>/summaries, so export only merges chunk summaries
+CHUNK_SIZE = 10
+SUMMARY_DIR = "summaries"
+
+# Final summary text of an exported session, next to its report
+SUMMARY_FILE = "summary.txt"
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Return the shared HTTP session, so summaries reuse pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        return _session
+
+def format_steps(steps, first_number=1):
+    """One prompt line per step"""
+    return "\n".join([
+        f"Step {i} ({step['timestamp']}): {step['window']}"
+        for i, step in enumerate(steps, first_number)
+    ])
+
+def build_prompt(steps):
+    """Build the summary prompt for a list of step dicts"""
+    steps_text = format_steps(steps)
+
+    return f"""Analyze these recorded steps and provide:
+1. A brief summary of what was accomplished
+2. A checklist of the main actions taken
+
+Recorded Steps:
+{steps_text}
+
+Please format your response as:
+SUMMARY: [brief summary]
+CHECKLIST:
+- [action 1]
+- [action 2]
+etc."""
+
+def build_chunk_prompt(steps, first_number):
+    """Prompt for summarizing one chunk of consecutive steps"""
+    return f"""Summarize in 2-3 sentences what the user did in these recorded steps.
+Mention the main actions and the applications used.
+
+Recorded Steps:
+{format_steps(steps, first_number)}"""
+
+def build_merge_prompt(parts):
+    """Prompt for the final summary from chunk summaries and leftover steps.
+
+    parts is a list of (first_step, last_step, text) in step order; text
+    is either a chunk summary or the raw step lines for that range.
+    """
+    sections = "\n\n".join(f"Steps {first}-{last}:\n{text}" for first, last, text in parts)
+
+    return f"""These are summaries of consecutive parts of one recorded session.
+Combine them and provide:
+1. A brief summary of what was accomplished
+2. A checklist of the main actions taken
+
+{sections}
+
+Please format your response as:
+SUMMARY: [brief summary]
+CHECKLIST:
+- [action 1]
+- [action 2]
+etc."""
+
+def stream_summary(prompt, cancel_event=None, timeout=(5, 60), on_response=None):
+    """Yield response text from Ollama as it is generated.
+
+    Stops early (closing the connection) once cancel_event is set.
+    timeout is (connect, seconds between streamed chunks). on_response
+    is called with the open response, so another thread can close it to
+    abort a read that is waiting on the server.
+    """
+    if cancel_event and cancel_event.is_set():
+        return
+    response = get_session().post(OLLAMA_URL,
+        json={
+            'model': OLLAMA_MODEL,
+            'prompt': prompt,
+            'stream': True
+        },
+        stream=True,
+        timeout=timeout)
+
+    with response:
+        if on_response:
+            on_response(response)
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if cancel_event and cancel_event.is_set():
+                return
+            if not line:
+                continue
+            data = json.loads(line)
+            if data.get('response'):
+                yield data['response']
+            if data.get('done'):
+                return
+
+def abort_response(response):
+    """Close a streaming response from another thread.
+
+    Closing alone does not wake a read blocked on the socket, so the
+    connection's socket is shut down first.
+    """
+    try:
+        sock = getattr(response.raw.connection, 'sock', None)
+        if sock:
+            sock.shutdown(socket.SHUT_RDWR)
+    except Exception:
+        pass
+    response.close()
+
+def chunk_summary_path(session_dir, first_number):
+    return os.path.join(session_dir, SUMMARY_DIR, f"steps_{first_number:05d}.json")
+
+def chunk_key(steps, first_number):
+    """Identifies a chunk's content, so a cached summary is only reused for the same steps"""
+    return hashlib.sha1(format_steps(steps, first_number).encode('utf-8')).hexdigest()
+
+def load_chunk_summary(session_dir, steps, first_number):
+    """Return the cached summary for a chunk, or None"""
+    try:
+        with open(chunk_summary_path(session_dir, first_number), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('key') != chunk_key(steps, first_number):
+        return None
+    return cached.get('summary')
+
+def summarize_chunk(session_dir, steps, first_number, cancel_event=None):
+    """Summarize one chunk of steps and cache it on disk (runs in the background)"""
+    if cancel_event and cancel_event.is_set():
+        return None
+    cached = load_chunk_summary(session_dir, steps, first_number)
+    if cached is not None:
+        return cached
+
+    summary = "".join(stream_summary(build_chunk_prompt(steps, first_number), cancel_event)).strip()
+    if cancel_event and cancel_event.is_set():
+        return None
+
+    path = chunk_summary_path(session_dir, first_number)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'first_step': first_number,
+            'last_step': first_number + len(steps) - 1,
+            'key': chunk_key(steps, first_number),
+            'summary': summary,
+        }, f, indent=2)
+    return summary
+
+def build_session_prompt(session_dir, steps):
+    """Summary prompt for a whole session, using cached chunk summaries.
+
+    Short sessions get the plain prompt. Otherwise each complete chunk is
+    represented by its cached summary (or its raw steps if it has none)
+    and the steps after the last chunk are listed as they are, so the
+    prompt stays small however long the session is.
+    """
+    if len(steps) < CHUNK_SIZE or not session_dir:
+        return build_prompt(steps)
+
+    parts = []
+    for start in range(0, len(steps), CHUNK_SIZE):
+        chunk = steps[start:start + CHUNK_SIZE]
+        first, last = start + 1, start + len(chunk)
+        summary = None
+        if len(chunk) == CHUNK_SIZE:
+            summary = load_chunk_summary(session_dir, chunk, first)
+        parts.append((first, last, summary or format_steps(chunk, first)))
+    return build_merge_prompt(parts)
+
+def fill_report_summary(path, summary):
+    """Replace the summary placeholder in an exported report"""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = f.read()
+    report = report.replace(SUMMARY_PLACEHOLDER, html.escape(summary), 1)
+    report = report.replace(RELOAD_PLACEHOLDER, "", 1)
+    # Swap in atomically; the report may be open in a browser that reloads it
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(report)
+    os.replace(tmp_path, path)
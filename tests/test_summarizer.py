@@ -0,0 +1,135 @@
+# tests/test_summarizer.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import summarizer
+
+
+class OllamaStub:
+    """Local stand-in for Ollama's /api/generate that streams NDJSON.
+
+    Each line is sent as its own HTTP chunk, like Ollama does. With
+    stall_after set, the stream pauses after that many lines until
+    release is set.
+    """
+
+    def __init__(self, lines, stall_after=None):
+        self.lines = lines
+        self.stall_after = stall_after
+        self.release = threading.Event()
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stub.requests.append(json.loads(body))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for number, line in enumerate(stub.lines):
+                        if number == stub.stall_after:
+                            stub.release.wait(5)
+                        data = (json.dumps(line) + "\n").encode()
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                        self.wfile.flush()
+                    self.wfile.write(b"0\r\n\r\n")
+                except OSError:
+                    pass   # client went away
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/generate"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    stubs = []
+
+    def start(lines, stall_after=None):
+        stub = OllamaStub(lines, stall_after)
+        stubs.append(stub)
+        monkeypatch.setattr(summarizer, "OLLAMA_URL", stub.url)
+        return stub
+
+    yield start
+    for stub in stubs:
+        stub.close()
+
+
+def test_stream_summary_yields_text_until_done(ollama):
+    stub = ollama([{"response": "Opened "}, {"response": ""}, {"response": "Notepad"},
+                   {"done": True}, {"response": " after done"}])
+
+    text = "".join(summarizer.stream_summary("the prompt"))
+
+    assert text == "Opened Notepad"
+    assert stub.requests == [{"model": summarizer.OLLAMA_MODEL, "prompt": "the prompt",
+                              "stream": True}]
+
+
+def test_stream_summary_cancelled_before_start_sends_nothing(ollama):
+    stub = ollama([{"response": "text"}, {"done": True}])
+    cancel = threading.Event()
+    cancel.set()
+
+    assert list(summarizer.stream_summary("prompt", cancel)) == []
+    assert stub.requests == []
+
+
+def test_stream_summary_stops_once_cancelled(ollama):
+    stub = ollama([{"response": "first"}, {"response": "second"}, {"done": True}], stall_after=1)
+    cancel = threading.Event()
+
+    stream = summarizer.stream_summary("prompt", cancel)
+    assert next(stream) == "first"
+    cancel.set()
+    stub.release.set()
+
+    assert list(stream) == []
+
+
+def test_closing_response_aborts_stalled_read(ollama):
+    ollama([{"response": "first"}, {"done": True}], stall_after=1)
+    responses = []
+
+    stream = summarizer.stream_summary("prompt", on_response=responses.append)
+    assert next(stream) == "first"
+    # The server is stalled; closing the response must unblock the reader
+    threading.Timer(0.2, summarizer.abort_response, [responses[0]]).start()
+    start = time.monotonic()
+    try:
+        rest = list(stream)
+    except Exception:
+        rest = []
+
+    assert rest == []
+    assert time.monotonic() - start < 3
+
+
+def test_fill_report_summary_replaces_placeholders(tmp_path):
+    report = tmp_path / "report.html"
+    report.write_text(f"<head>{summarizer.RELOAD_PLACEHOLDER}</head>"
+                      f"<body><p>{summarizer.SUMMARY_PLACEHOLDER}</p></body>", encoding="utf-8")
+
+    summarizer.fill_report_summary(str(report), "SUMMARY: <b> & more")
+
+    assert report.read_text(encoding="utf-8") == \
+        "<head></head><body><p>SUMMARY: &lt;b&gt; &amp; more</p></body>"
+    assert not (tmp_path / "report.html.tmp").exists()